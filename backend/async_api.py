@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.schemas import UserProfileCreate, UserProfileResponse
+from backend.async_crud import get_user_profile_cached, create_user_profile, update_user_profile
+from backend.cache import conditional_response
+from backend.dependencies import get_async_db
+
+# Async counterparts of the profile endpoints in backend/main.py (DB_ASYNC=1)
+profile_router = APIRouter()
+
+@profile_router.get(
+    "/api/profile/{user_id}",
+    response_model=UserProfileResponse,
+    summary="Fetch a user profile"
+)
+async def read_profile(
+    request: Request,
+    user_id: int = Path(..., description="ID of the user"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    entry = await get_user_profile_cached(db, user_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="User profile not found")
+    return conditional_response(request, entry)
+
+@profile_router.post(
+    "/api/profile",
+    response_model=UserProfileResponse,
+    summary="Create a new user profile"
+)
+async def create_profile(
+    profile_in: UserProfileCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await create_user_profile(db, profile_in)
+
+@profile_router.put(
+    "/api/profile/{user_id}",
+    response_model=UserProfileResponse,
+    summary="Update an existing user profile"
+)
+async def update_profile(
+    user_id: int = Path(..., description="ID of the user to update"),
+    profile_in: UserProfileCreate = ...,
+    db: AsyncSession = Depends(get_async_db)
+):
+    updated = await update_user_profile(db, user_id, profile_in)
+    if not updated:
+        raise HTTPException(status_code=404, detail="User profile not found")
+    return updated
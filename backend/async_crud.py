@@ -0,0 +1,36 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.cache import api_cache, profile_key
+from backend.crud import profile_row_query
+from backend.models import UserProfile
+from backend.schemas import UserProfileCreate
+
+async def get_user_profile(db: AsyncSession, user_id: int):
+    return await db.get(UserProfile, user_id)
+
+async def get_user_profile_cached(db: AsyncSession, user_id: int):
+    """
+    Read-through cached profile: {"etag", "body"} or None if missing.
+    """
+    async def load():
+        row = (await db.execute(profile_row_query(user_id))).mappings().first()
+        return dict(row) if row else None
+    return await api_cache.aget_or_load(profile_key(user_id), load)
+
+async def create_user_profile(db: AsyncSession, data: UserProfileCreate):
+    db_profile = UserProfile(**data.dict())
+    db.add(db_profile)
+    await db.commit()
+    await db.refresh(db_profile)
+    api_cache.invalidate(profile_key(db_profile.id))
+    return db_profile
+
+async def update_user_profile(db: AsyncSession, user_id: int, data: UserProfileCreate):
+    db_profile = await get_user_profile(db, user_id)
+    if not db_profile:
+        return None
+    for field, value in data.dict().items():
+        setattr(db_profile, field, value)
+    await db.commit()
+    api_cache.invalidate(profile_key(user_id))
+    await db.refresh(db_profile)
+    return db_profile
@@ -0,0 +1,217 @@
+"""
+Read-through cache for per-user API payloads (profiles, goal lists).
+
+Entries are ``{"etag": ..., "body": ...}`` dicts holding the response
+already encoded as JSON text, so a hit is served without re-serializing and
+any backend can hold them. The default backend is a bounded in-process LRU;
+call ``set_cache_backend`` with e.g. ``RedisCacheBackend`` to share entries
+between instances. CRUD functions invalidate the keys they touch.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+API_CACHE_SIZE = int(os.getenv("API_CACHE_SIZE", "10000"))
+# Upper bound on staleness when another instance writes (in-process backend)
+API_CACHE_TTL = float(os.getenv("API_CACHE_TTL", "300"))
+# Set to share the cache between instances, e.g. redis://localhost:6379/0
+API_CACHE_REDIS_URL = os.getenv("API_CACHE_REDIS_URL")
+
+
+class CacheBackend:
+    """
+    Minimal interface a cache backend has to provide.
+    """
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl_seconds):
+        raise NotImplementedError
+
+    def delete(self, *keys):
+        raise NotImplementedError
+
+
+class LRUCacheBackend(CacheBackend):
+    def __init__(self, max_entries=API_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at and expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl_seconds):
+        expires_at = time.time() + ttl_seconds if ttl_seconds > 0 else 0
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared backend on Redis (requires the optional ``redis`` package).
+    """
+
+    def __init__(self, url, prefix="fyza:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl_seconds):
+        ttl = int(ttl_seconds) if ttl_seconds > 0 else None
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl)
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+
+def etag_for(body: bytes):
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def conditional_response(request: Request, entry):
+    """
+    304 if the client's If-None-Match matches ``entry``; otherwise the cached
+    JSON body with its validator headers. The body was built from trusted
+    rows, so it bypasses response_model validation.
+    """
+    headers = {"ETag": entry["etag"], "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+
+def make_entry(data):
+    # orjson handles UUID/date/datetime/Enum natively; anything else goes
+    # through FastAPI's encoder
+    body = orjson.dumps(data, default=jsonable_encoder)
+    return {"etag": etag_for(body), "body": body.decode("utf-8")}
+
+
+class ReadThroughCache:
+    def __init__(self, backend=None, ttl_seconds=API_CACHE_TTL):
+        self.backend = backend or LRUCacheBackend()
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Bumped on every invalidation; a load that overlapped a write is not
+        # stored, so a stale read can never repopulate an invalidated key
+        self._write_seq = 0
+
+    def _store(self, key, data, seq):
+        entry = make_entry(data)
+        if seq == self._write_seq:
+            self.backend.set(key, entry, self.ttl_seconds)
+        return entry
+
+    def get_or_load(self, key, loader):
+        """
+        Return the cached entry for ``key``, or build it from ``loader()``.
+
+        ``loader`` returns the payload or None; None is not cached.
+        """
+        entry = self.backend.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        seq = self._write_seq
+        data = loader()
+        if data is None:
+            return None
+        return self._store(key, data, seq)
+
+    async def aget_or_load(self, key, loader):
+        """
+        ``get_or_load`` for coroutine loaders.
+        """
+        entry = self.backend.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        seq = self._write_seq
+        data = await loader()
+        if data is None:
+            return None
+        return self._store(key, data, seq)
+
+    def invalidate(self, *keys):
+        keys = [key for key in dict.fromkeys(keys)]
+        if keys:
+            self._write_seq += 1
+            self.invalidations += len(keys)
+            self.backend.delete(*keys)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def profile_key(user_id):
+    return f"profile:{user_id}"
+
+
+def goals_key(user_id):
+    return f"goals:{user_id}"
+
+
+def projections_key(user_id, goals_etag, params):
+    # Goal lists change ETag on every write, so stale projections are never hit
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return f"projections:{user_id}:{goals_etag.strip(chr(34))}:{digest}"
+
+
+api_cache = ReadThroughCache(RedisCacheBackend(API_CACHE_REDIS_URL) if API_CACHE_REDIS_URL else None)
+
+
+def set_cache_backend(backend):
+    api_cache.backend = backend
@@ -1,15 +1,33 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from backend.cache import api_cache, profile_key
 from backend.models import UserProfile
-from backend.schemas import UserProfileCreate
+from backend.schemas import UserProfileCreate, UserProfileResponse
+
+# Columns served by UserProfileResponse, read as plain rows (no ORM entity)
+PROFILE_RESPONSE_COLUMNS = [UserProfile.__table__.c[name] for name in UserProfileResponse.model_fields]
+
+def profile_row_query(user_id: int):
+    return select(*PROFILE_RESPONSE_COLUMNS).where(UserProfile.id == user_id)
 
 def get_user_profile(db: Session, user_id: int):
     return db.query(UserProfile).filter(UserProfile.id == user_id).first()
 
+def get_user_profile_cached(db: Session, user_id: int):
+    """
+    Read-through cached profile: {"etag", "body"} or None if missing.
+    """
+    def load():
+        row = db.execute(profile_row_query(user_id)).mappings().first()
+        return dict(row) if row else None
+    return api_cache.get_or_load(profile_key(user_id), load)
+
 def create_user_profile(db: Session, data: UserProfileCreate):
     db_profile = UserProfile(**data.dict())
     db.add(db_profile)
     db.commit()
     db.refresh(db_profile)
+    api_cache.invalidate(profile_key(db_profile.id))
     return db_profile
 
 def update_user_profile(db: Session, user_id: int, data: UserProfileCreate):
@@ -19,5 +37,6 @@ def update_user_profile(db: Session, user_id: int, data: UserProfileCreate):
     for field, value in data.dict().items():
         setattr(db_profile, field, value)
     db.commit()
+    api_cache.invalidate(profile_key(user_id))
     db.refresh(db_profile)
     return db_profile
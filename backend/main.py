@@ -1,17 +1,20 @@
-from fastapi import FastAPI, Depends, HTTPException, Path
+from fastapi import APIRouter, FastAPI, Depends, HTTPException, Path, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from backend.models import Base
 from backend.schemas import UserProfileCreate, UserProfileResponse
-from backend.crud import get_user_profile, create_user_profile, update_user_profile
-from backend.dependencies import engine, get_db
-from backend.profile.financialgoals.api_router import api_router
+from backend.cache import api_cache, conditional_response
+from backend.crud import get_user_profile_cached, create_user_profile, update_user_profile
+from backend.async_api import profile_router as async_profile_router
+from backend.dependencies import DB_ASYNC, engine, get_db, get_pool_stats, ping_database
+from backend.profile.financialgoals.api_router import api_router, async_api_router
 
 # Initialize tables (creates tables if they don't exist)
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # --- CORS MIDDLEWARE (allow requests from your frontend during dev) ---
 app.add_middleware(
@@ -20,28 +23,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
-# --- Register all API routers (financial goals etc.) ---
-app.include_router(api_router)
-
 # --- User Profile Endpoints ---
 
-@app.get(
+profile_router = APIRouter()
+
+@profile_router.get(
     "/api/profile/{user_id}",
     response_model=UserProfileResponse,
     summary="Fetch a user profile"
 )
 def read_profile(
+    request: Request,
     user_id: int = Path(..., description="ID of the user"),
     db: Session = Depends(get_db)
 ):
-    db_profile = get_user_profile(db, user_id)
-    if not db_profile:
+    entry = get_user_profile_cached(db, user_id)
+    if not entry:
         raise HTTPException(status_code=404, detail="User profile not found")
-    return db_profile
+    return conditional_response(request, entry)
 
-@app.post(
+@profile_router.post(
     "/api/profile",
     response_model=UserProfileResponse,
     summary="Create a new user profile"
@@ -52,7 +56,7 @@ def create_profile(
 ):
     return create_user_profile(db, profile_in)
 
-@app.put(
+@profile_router.put(
     "/api/profile/{user_id}",
     response_model=UserProfileResponse,
     summary="Update an existing user profile"
@@ -66,3 +70,24 @@ def update_profile(
     if not updated:
         raise HTTPException(status_code=404, detail="User profile not found")
     return updated
+
+# --- Register all API routers (profile, financial goals etc.) ---
+# DB_ASYNC=1 serves the same routes from AsyncSession-based handlers
+if DB_ASYNC:
+    app.include_router(async_profile_router)
+    app.include_router(async_api_router)
+else:
+    app.include_router(profile_router)
+    app.include_router(api_router)
+
+# --- Operational Endpoints ---
+
+@app.get("/api/health/db", summary="Database reachability and connection pool statistics")
+def db_pool_health():
+    ok, database = ping_database()
+    body = {"database": database, "pool": get_pool_stats()}
+    return body if ok else ORJSONResponse(body, status_code=503)
+
+@app.get("/api/health/cache", summary="Profile/goals read-through cache statistics")
+def cache_health():
+    return api_cache.stats()
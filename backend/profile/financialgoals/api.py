@@ -2,20 +2,33 @@
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
+from backend.cache import conditional_response
 from backend.dependencies import get_db
+from .params import goal_list_params, is_full_listing, projection_params
+from .projections import goal_projections_entry
 from .schemas import (
+    FinancialGoalBulkDelete,
+    FinancialGoalBulkUpdateItem,
     FinancialGoalCreate,
     FinancialGoalUpdate,
     FinancialGoalResponse,
+    GoalProjectionsResponse,
 )
 from .crud import (
-    get_goals_for_user,
+    GoalsNotFound,
+    InvalidCursor,
+    get_goals_for_user_cached,
+    list_goals,
     create_goal,
+    create_goals,
     update_goal,
+    update_goals,
     delete_goal,
+    delete_goals,
 )
 
 router = APIRouter(
@@ -26,12 +39,36 @@ router = APIRouter(
 @router.get(
     "/{user_id}",
     response_model=List[FinancialGoalResponse],
-    summary="List all financial goals for a user",
+    summary="List a user's financial goals (filterable, keyset-paginated)",
 )
 def read_goals_for_user(
-        user_id: int, db: Session = Depends(get_db)
+        user_id: int,
+        request: Request,
+        params: dict = Depends(goal_list_params),
+        db: Session = Depends(get_db),
+):
+    if is_full_listing(params):
+        return conditional_response(request, get_goals_for_user_cached(db, user_id))
+    try:
+        goals, next_cursor = list_goals(db, user_id, **params)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    # Rows come straight from the DB, so skip response_model re-validation
+    return ORJSONResponse(goals, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+@router.get(
+    "/{user_id}/projections",
+    response_model=GoalProjectionsResponse,
+    summary="Project contributions and success odds for all of a user's goals",
+)
+def read_goal_projections(
+        user_id: int,
+        request: Request,
+        params: dict = Depends(projection_params),
+        db: Session = Depends(get_db),
 ):
-    return get_goals_for_user(db, user_id)
+    goals_entry = get_goals_for_user_cached(db, user_id)
+    return conditional_response(request, goal_projections_entry(user_id, goals_entry, params))
 
 @router.post(
     "/",
@@ -44,6 +81,48 @@ def create_financial_goal(
 ):
     return create_goal(db, goal_in)
 
+# --- Bulk endpoints (declared before /{goal_id} so "bulk" is not parsed as an id) ---
+
+@router.post(
+    "/bulk",
+    response_model=List[FinancialGoalResponse],
+    summary="Create several financial goals in one transaction",
+    operation_id="financial_goals_bulk_create",
+)
+def bulk_create_financial_goals(
+        goals_in: List[FinancialGoalCreate], db: Session = Depends(get_db)
+):
+    return ORJSONResponse(create_goals(db, goals_in))
+
+@router.put(
+    "/bulk",
+    response_model=List[FinancialGoalResponse],
+    summary="Update several financial goals in one transaction",
+    operation_id="financial_goals_bulk_update",
+)
+def bulk_update_financial_goals(
+        goals_in: List[FinancialGoalBulkUpdateItem], db: Session = Depends(get_db)
+):
+    try:
+        return ORJSONResponse(update_goals(db, goals_in))
+    except GoalsNotFound as exc:
+        raise HTTPException(status_code=404, detail=f"Financial goals not found: {[str(i) for i in exc.goal_ids]}")
+
+@router.delete(
+    "/bulk",
+    status_code=204,
+    summary="Delete several financial goals in one transaction",
+    operation_id="financial_goals_bulk_delete",
+)
+def bulk_delete_financial_goals(
+        request: FinancialGoalBulkDelete, db: Session = Depends(get_db)
+):
+    try:
+        delete_goals(db, request.goal_ids)
+    except GoalsNotFound as exc:
+        raise HTTPException(status_code=404, detail=f"Financial goals not found: {[str(i) for i in exc.goal_ids]}")
+    return Response(status_code=204)
+
 @router.put(
     "/{goal_id}",
     response_model=FinancialGoalResponse,
@@ -2,6 +2,11 @@
 from fastapi import APIRouter
 
 from backend.profile.financialgoals.api import router as financial_goals_router
+from backend.profile.financialgoals.async_api import router as async_financial_goals_router
 
 api_router = APIRouter()
 api_router.include_router(financial_goals_router)
+
+# Same routes served from AsyncSession handlers (DB_ASYNC=1)
+async_api_router = APIRouter()
+async_api_router.include_router(async_financial_goals_router)
@@ -0,0 +1,155 @@
+# backend/profile/financialgoals/async_api.py
+from typing import List
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.cache import conditional_response
+from backend.dependencies import get_async_db
+from .params import goal_list_params, is_full_listing, projection_params
+from .projections import goal_projections_entry
+from .schemas import (
+    FinancialGoalBulkDelete,
+    FinancialGoalBulkUpdateItem,
+    FinancialGoalCreate,
+    FinancialGoalUpdate,
+    FinancialGoalResponse,
+    GoalProjectionsResponse,
+)
+from .crud import GoalsNotFound, InvalidCursor
+from .async_crud import (
+    get_goals_for_user_cached,
+    list_goals,
+    create_goal,
+    create_goals,
+    update_goal,
+    update_goals,
+    delete_goal,
+    delete_goals,
+)
+
+router = APIRouter(
+    prefix="/api/financial-goals",
+    tags=["financial_goals"],
+)
+
+@router.get(
+    "/{user_id}",
+    response_model=List[FinancialGoalResponse],
+    summary="List a user's financial goals (filterable, keyset-paginated)",
+)
+async def read_goals_for_user(
+        user_id: int,
+        request: Request,
+        params: dict = Depends(goal_list_params),
+        db: AsyncSession = Depends(get_async_db),
+):
+    if is_full_listing(params):
+        return conditional_response(request, await get_goals_for_user_cached(db, user_id))
+    try:
+        goals, next_cursor = await list_goals(db, user_id, **params)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    # Rows come straight from the DB, so skip response_model re-validation
+    return ORJSONResponse(goals, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+@router.get(
+    "/{user_id}/projections",
+    response_model=GoalProjectionsResponse,
+    summary="Project contributions and success odds for all of a user's goals",
+)
+async def read_goal_projections(
+        user_id: int,
+        request: Request,
+        params: dict = Depends(projection_params),
+        db: AsyncSession = Depends(get_async_db),
+):
+    goals_entry = await get_goals_for_user_cached(db, user_id)
+    # The simulation is CPU bound; keep it off the event loop
+    entry = await run_in_threadpool(goal_projections_entry, user_id, goals_entry, params)
+    return conditional_response(request, entry)
+
+@router.post(
+    "/",
+    response_model=FinancialGoalResponse,
+    summary="Create a new financial goal",
+    operation_id="financial_goals_create",
+)
+async def create_financial_goal(
+        goal_in: FinancialGoalCreate, db: AsyncSession = Depends(get_async_db)
+):
+    return await create_goal(db, goal_in)
+
+# --- Bulk endpoints (declared before /{goal_id} so "bulk" is not parsed as an id) ---
+
+@router.post(
+    "/bulk",
+    response_model=List[FinancialGoalResponse],
+    summary="Create several financial goals in one transaction",
+    operation_id="financial_goals_bulk_create",
+)
+async def bulk_create_financial_goals(
+        goals_in: List[FinancialGoalCreate], db: AsyncSession = Depends(get_async_db)
+):
+    return ORJSONResponse(await create_goals(db, goals_in))
+
+@router.put(
+    "/bulk",
+    response_model=List[FinancialGoalResponse],
+    summary="Update several financial goals in one transaction",
+    operation_id="financial_goals_bulk_update",
+)
+async def bulk_update_financial_goals(
+        goals_in: List[FinancialGoalBulkUpdateItem], db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        return ORJSONResponse(await update_goals(db, goals_in))
+    except GoalsNotFound as exc:
+        raise HTTPException(status_code=404, detail=f"Financial goals not found: {[str(i) for i in exc.goal_ids]}")
+
+@router.delete(
+    "/bulk",
+    status_code=204,
+    summary="Delete several financial goals in one transaction",
+    operation_id="financial_goals_bulk_delete",
+)
+async def bulk_delete_financial_goals(
+        request: FinancialGoalBulkDelete, db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        await delete_goals(db, request.goal_ids)
+    except GoalsNotFound as exc:
+        raise HTTPException(status_code=404, detail=f"Financial goals not found: {[str(i) for i in exc.goal_ids]}")
+    return Response(status_code=204)
+
+@router.put(
+    "/{goal_id}",
+    response_model=FinancialGoalResponse,
+    summary="Update an existing financial goal",
+    operation_id="financial_goals_update",
+)
+async def update_financial_goal(
+        goal_id: UUID,
+        goal_in: FinancialGoalUpdate,
+        db: AsyncSession = Depends(get_async_db),
+):
+    updated = await update_goal(db, goal_id, goal_in)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Financial goal not found")
+    return updated
+
+@router.delete(
+    "/{goal_id}",
+    status_code=204,
+    summary="Delete a financial goal",
+)
+async def delete_financial_goal(
+        goal_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
+    success = await delete_goal(db, goal_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Financial goal not found")
+    return Response(status_code=204)
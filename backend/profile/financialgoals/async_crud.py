@@ -0,0 +1,138 @@
+# backend/profile/financialgoals/async_crud.py
+import uuid
+from typing import List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.cache import api_cache, goals_key
+from .crud import GoalsNotFound, goals_page_query, goals_table, invalidate_goals, split_page
+from .models import FinancialGoal
+from .schemas import FinancialGoalBulkUpdateItem, FinancialGoalCreate, FinancialGoalUpdate
+
+
+async def get_goals_for_user(db: AsyncSession, user_id: int) -> List[dict]:
+    result = await db.execute(goals_page_query(user_id))
+    return [dict(row) for row in result.mappings()]
+
+
+async def get_goals_for_user_cached(db: AsyncSession, user_id: int) -> dict:
+    """
+    Read-through cached goal list: {"etag", "body"}.
+    """
+    return await api_cache.aget_or_load(goals_key(user_id), lambda: get_goals_for_user(db, user_id))
+
+
+async def list_goals(
+    db: AsyncSession, user_id: int, limit: Optional[int] = None, **filters
+) -> Tuple[list, Optional[str]]:
+    """
+    Filtered, ordered page of goals; returns (goal dicts, next cursor or None).
+    """
+    result = await db.execute(goals_page_query(user_id, limit=limit, **filters))
+    return split_page(result.mappings(), limit)
+
+
+async def get_goal(db: AsyncSession, goal_id: UUID) -> Optional[FinancialGoal]:
+    return await db.get(FinancialGoal, goal_id)
+
+
+async def create_goal(db: AsyncSession, goal_in: FinancialGoalCreate) -> FinancialGoal:
+    goal = FinancialGoal(
+        user_id=goal_in.user_id,
+        goal_name=goal_in.goal_name,
+        target_amount=goal_in.target_amount,
+        target_date=goal_in.target_date,
+        priority=goal_in.priority,
+    )
+    db.add(goal)
+    await db.commit()
+    invalidate_goals(goal_in.user_id)
+    await db.refresh(goal)
+    return goal
+
+
+async def update_goal(
+    db: AsyncSession, goal_id: UUID, goal_in: FinancialGoalUpdate
+) -> Optional[FinancialGoal]:
+    goal = await get_goal(db, goal_id)
+    if not goal:
+        return None
+    for field, value in goal_in.dict(exclude_unset=True).items():
+        setattr(goal, field, value)
+    await db.commit()
+    invalidate_goals(goal.user_id)
+    await db.refresh(goal)
+    return goal
+
+
+async def delete_goal(db: AsyncSession, goal_id: UUID) -> bool:
+    goal = await get_goal(db, goal_id)
+    if not goal:
+        return False
+    user_id = goal.user_id
+    await db.delete(goal)
+    await db.commit()
+    invalidate_goals(user_id)
+    return True
+
+
+# --- Bulk operations: one transaction, rows come back via RETURNING ---
+
+async def create_goals(db: AsyncSession, goals_in: Sequence[FinancialGoalCreate]) -> List[dict]:
+    if not goals_in:
+        return []
+    rows = [{"goal_id": uuid.uuid4(), **goal_in.dict()} for goal_in in goals_in]
+    result = await db.execute(insert(goals_table).returning(*goals_table.c), rows)
+    created = [dict(row) for row in result.mappings().all()]
+    await db.commit()
+    invalidate_goals(*(row["user_id"] for row in created))
+    return created
+
+
+async def update_goals(db: AsyncSession, goals_in: Sequence[FinancialGoalBulkUpdateItem]) -> List[dict]:
+    updated, missing = [], []
+    try:
+        for goal_in in goals_in:
+            values = goal_in.dict(exclude_unset=True, exclude={"goal_id"})
+            if values:
+                stmt = (
+                    update(goals_table)
+                    .where(goals_table.c.goal_id == goal_in.goal_id)
+                    .values(**values)
+                    .returning(*goals_table.c)
+                )
+            else:
+                stmt = select(goals_table).where(goals_table.c.goal_id == goal_in.goal_id)
+            row = (await db.execute(stmt)).mappings().first()
+            if row is None:
+                missing.append(goal_in.goal_id)
+            else:
+                updated.append(dict(row))
+        if missing:
+            raise GoalsNotFound(missing)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    invalidate_goals(*(row["user_id"] for row in updated))
+    return updated
+
+
+async def delete_goals(db: AsyncSession, goal_ids: Sequence[UUID]) -> None:
+    goal_ids = list(dict.fromkeys(goal_ids))
+    if not goal_ids:
+        return
+    result = await db.execute(
+        delete(goals_table)
+        .where(goals_table.c.goal_id.in_(goal_ids))
+        .returning(goals_table.c.goal_id, goals_table.c.user_id)
+    )
+    deleted = result.all()
+    missing = sorted(set(goal_ids) - {row.goal_id for row in deleted}, key=str)
+    if missing:
+        await db.rollback()
+        raise GoalsNotFound(missing)
+    await db.commit()
+    invalidate_goals(*(row.user_id for row in deleted))
@@ -1,15 +1,123 @@
 # backend/profile/financialgoals/crud.py
-from typing import List, Optional
+import base64
+import os
+import uuid
+from datetime import date
+from typing import List, Optional, Sequence, Tuple
 from uuid import UUID
 
+from sqlalchemy import delete, insert, select, tuple_, update
 from sqlalchemy.orm import Session
 
+from backend.cache import api_cache, goals_key
 from .models import FinancialGoal
-from .schemas import FinancialGoalCreate, FinancialGoalUpdate
+from .schemas import FinancialGoalBulkUpdateItem, FinancialGoalCreate, FinancialGoalResponse, FinancialGoalUpdate
 
+goals_table = FinancialGoal.__table__
+# Columns served by FinancialGoalResponse; listings select these as plain rows
+# instead of loading ORM entities
+GOAL_RESPONSE_COLUMNS = [goals_table.c[name] for name in FinancialGoalResponse.model_fields]
 
-def get_goals_for_user(db: Session, user_id: int) -> List[FinancialGoal]:
-    return db.query(FinancialGoal).filter(FinancialGoal.user_id == user_id).all()
+# Upper bound for ?limit= on goal listings
+MAX_GOALS_PAGE_SIZE = int(os.getenv("MAX_GOALS_PAGE_SIZE", "500"))
+# Sort option -> descending?; both walk the (user_id, target_date, goal_id) index
+GOAL_SORTS = {"target_date": False, "-target_date": True}
+
+
+class GoalsNotFound(Exception):
+    """Raised by the bulk helpers when some goal ids do not exist."""
+
+    def __init__(self, goal_ids):
+        super().__init__(f"Financial goals not found: {goal_ids}")
+        self.goal_ids = goal_ids
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(target_date: date, goal_id: UUID) -> str:
+    raw = f"{target_date.isoformat()}|{goal_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        target_date, goal_id = raw.split("|")
+        return date.fromisoformat(target_date), UUID(goal_id)
+    except ValueError as exc:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from exc
+
+
+def goals_page_query(
+    user_id: int,
+    priorities: Optional[Sequence[str]] = None,
+    target_date_from: Optional[date] = None,
+    target_date_to: Optional[date] = None,
+    sort: str = "target_date",
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+):
+    """
+    SELECT for one page of a user's goals, keyset-paginated on
+    (target_date, goal_id). Fetches ``limit + 1`` rows so the caller can
+    tell whether another page follows (see ``split_page``).
+    """
+    descending = GOAL_SORTS[sort]
+    c = goals_table.c
+    stmt = select(*GOAL_RESPONSE_COLUMNS).where(c.user_id == user_id)
+    if priorities:
+        stmt = stmt.where(c.priority.in_(priorities))
+    if target_date_from is not None:
+        stmt = stmt.where(c.target_date >= target_date_from)
+    if target_date_to is not None:
+        stmt = stmt.where(c.target_date <= target_date_to)
+    if cursor:
+        key = tuple_(c.target_date, c.goal_id)
+        after = decode_cursor(cursor)
+        stmt = stmt.where(key < after if descending else key > after)
+    if descending:
+        stmt = stmt.order_by(c.target_date.desc(), c.goal_id.desc())
+    else:
+        stmt = stmt.order_by(c.target_date, c.goal_id)
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    return stmt
+
+
+def split_page(rows, limit: Optional[int]) -> Tuple[List[dict], Optional[str]]:
+    """
+    Trim the look-ahead row; returns (goal dicts, next cursor or None).
+    """
+    goals = [dict(row) for row in rows]
+    if limit is None or len(goals) <= limit:
+        return goals, None
+    goals = goals[:limit]
+    return goals, encode_cursor(goals[-1]["target_date"], goals[-1]["goal_id"])
+
+
+def invalidate_goals(*user_ids) -> None:
+    api_cache.invalidate(*(goals_key(user_id) for user_id in user_ids))
+
+
+def get_goals_for_user(db: Session, user_id: int) -> List[dict]:
+    return [dict(row) for row in db.execute(goals_page_query(user_id)).mappings()]
+
+
+def get_goals_for_user_cached(db: Session, user_id: int) -> dict:
+    """
+    Read-through cached goal list: {"etag", "body"}.
+    """
+    return api_cache.get_or_load(goals_key(user_id), lambda: get_goals_for_user(db, user_id))
+
+
+def list_goals(db: Session, user_id: int, limit: Optional[int] = None, **filters) -> Tuple[List[dict], Optional[str]]:
+    """
+    Filtered, ordered page of goals; returns (goal dicts, next cursor or None).
+    """
+    stmt = goals_page_query(user_id, limit=limit, **filters)
+    return split_page(db.execute(stmt).mappings(), limit)
 
 
 def get_goal(db: Session, goal_id: UUID) -> Optional[FinancialGoal]:
@@ -26,6 +134,7 @@ def create_goal(db: Session, goal_in: FinancialGoalCreate) -> FinancialGoal:
     )
     db.add(goal)
     db.commit()
+    invalidate_goals(goal_in.user_id)
     db.refresh(goal)
     return goal
 
@@ -39,6 +148,7 @@ def update_goal(
     for field, value in goal_in.dict(exclude_unset=True).items():
         setattr(goal, field, value)
     db.commit()
+    invalidate_goals(goal.user_id)
     db.refresh(goal)
     return goal
 
@@ -47,6 +157,68 @@ def delete_goal(db: Session, goal_id: UUID) -> bool:
     goal = get_goal(db, goal_id)
     if not goal:
         return False
+    user_id = goal.user_id
     db.delete(goal)
     db.commit()
+    invalidate_goals(user_id)
     return True
+
+
+# --- Bulk operations: one transaction, rows come back via RETURNING ---
+
+def create_goals(db: Session, goals_in: Sequence[FinancialGoalCreate]) -> List[dict]:
+    if not goals_in:
+        return []
+    rows = [{"goal_id": uuid.uuid4(), **goal_in.dict()} for goal_in in goals_in]
+    created = db.execute(
+        insert(goals_table).returning(*goals_table.c), rows
+    ).mappings().all()
+    db.commit()
+    invalidate_goals(*(row["user_id"] for row in created))
+    return [dict(row) for row in created]
+
+
+def update_goals(db: Session, goals_in: Sequence[FinancialGoalBulkUpdateItem]) -> List[dict]:
+    updated, missing = [], []
+    try:
+        for goal_in in goals_in:
+            values = goal_in.dict(exclude_unset=True, exclude={"goal_id"})
+            if values:
+                stmt = (
+                    update(goals_table)
+                    .where(goals_table.c.goal_id == goal_in.goal_id)
+                    .values(**values)
+                    .returning(*goals_table.c)
+                )
+            else:
+                stmt = select(goals_table).where(goals_table.c.goal_id == goal_in.goal_id)
+            row = db.execute(stmt).mappings().first()
+            if row is None:
+                missing.append(goal_in.goal_id)
+            else:
+                updated.append(dict(row))
+        if missing:
+            raise GoalsNotFound(missing)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    invalidate_goals(*(row["user_id"] for row in updated))
+    return updated
+
+
+def delete_goals(db: Session, goal_ids: Sequence[UUID]) -> None:
+    goal_ids = list(dict.fromkeys(goal_ids))
+    if not goal_ids:
+        return
+    deleted = db.execute(
+        delete(goals_table)
+        .where(goals_table.c.goal_id.in_(goal_ids))
+        .returning(goals_table.c.goal_id, goals_table.c.user_id)
+    ).all()
+    missing = sorted(set(goal_ids) - {row.goal_id for row in deleted}, key=str)
+    if missing:
+        db.rollback()
+        raise GoalsNotFound(missing)
+    db.commit()
+    invalidate_goals(*(row.user_id for row in deleted))
@@ -10,6 +10,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Enum as SqlEnum,
 )
 from sqlalchemy.dialects.postgresql import UUID
@@ -25,6 +26,12 @@ class PriorityEnum(str, enum.Enum):
 
 class FinancialGoal(Base):
     __tablename__ = "financial_goals"
+    __table_args__ = (
+        # Keyset pagination: WHERE user_id = ? ORDER BY target_date, goal_id
+        Index("idx_financial_goals_user_target_date", "user_id", "target_date", "goal_id"),
+        # Same walk when a single priority is filtered
+        Index("idx_financial_goals_user_priority_target_date", "user_id", "priority", "target_date", "goal_id"),
+    )
 
     goal_id = Column(
         UUID(as_uuid=True),
@@ -0,0 +1,77 @@
+# backend/profile/financialgoals/params.py
+from datetime import date
+from typing import List, Literal, Optional
+
+from fastapi import Query
+
+from .crud import MAX_GOALS_PAGE_SIZE
+from .projections import (
+    PROJECTION_CONFIDENCE,
+    PROJECTION_INFLATION,
+    PROJECTION_MAX_PATHS,
+    PROJECTION_PATHS,
+    PROJECTION_SEED,
+    RISK_PROFILES,
+)
+from .schemas import PriorityEnum
+
+# What a plain GET /api/financial-goals/{user_id} resolves to
+FULL_LISTING = {
+    "priorities": None,
+    "target_date_from": None,
+    "target_date_to": None,
+    "sort": "target_date",
+    "cursor": None,
+    "limit": None,
+}
+
+
+def goal_list_params(
+        priority: Optional[List[PriorityEnum]] = Query(None, description="Only goals with these priorities"),
+        target_date_from: Optional[date] = Query(None, description="Earliest target date (inclusive)"),
+        target_date_to: Optional[date] = Query(None, description="Latest target date (inclusive)"),
+        sort: Literal["target_date", "-target_date"] = Query("target_date", description="Sort by target date"),
+        limit: Optional[int] = Query(None, ge=1, le=MAX_GOALS_PAGE_SIZE, description="Page size"),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+) -> dict:
+    """
+    Listing filters shared by the sync and async goal routes.
+    """
+    return {
+        "priorities": [p.value for p in priority] if priority else None,
+        "target_date_from": target_date_from,
+        "target_date_to": target_date_to,
+        "sort": sort,
+        "cursor": cursor,
+        "limit": limit,
+    }
+
+
+def is_full_listing(params: dict) -> bool:
+    """
+    Only the unfiltered, unpaginated listing goes through the read cache.
+    """
+    return params == FULL_LISTING
+
+
+def projection_params(
+        inflation: float = Query(PROJECTION_INFLATION, ge=0, le=0.5, description="Annual inflation"),
+        risk_profile: Literal[tuple(RISK_PROFILES)] = Query("moderate", description="Return/volatility preset"),
+        expected_return: Optional[float] = Query(None, gt=-0.5, le=1, description="Annual return (overrides preset)"),
+        volatility: Optional[float] = Query(None, ge=0, le=1, description="Annual volatility (overrides preset)"),
+        paths: int = Query(PROJECTION_PATHS, ge=100, le=PROJECTION_MAX_PATHS, description="Monte Carlo paths"),
+        confidence: float = Query(PROJECTION_CONFIDENCE, gt=0, lt=1, description="Target success probability"),
+        seed: int = Query(PROJECTION_SEED, ge=0, description="Random seed (fixed so results are cacheable)"),
+) -> dict:
+    """
+    Projection assumptions shared by the sync and async goal routes.
+    """
+    return {
+        "inflation": inflation,
+        "risk_profile": risk_profile,
+        "expected_return": expected_return,
+        "volatility": volatility,
+        "paths": paths,
+        "confidence": confidence,
+        "seed": seed,
+    }
@@ -1,7 +1,7 @@
 # backend/profile/financialgoals/schemas.py
 from datetime import date, datetime
 from uuid import UUID
-from typing import Optional
+from typing import List, Optional
 import enum
 
 from pydantic import BaseModel, Field, validator
@@ -44,6 +44,14 @@ class FinancialGoalUpdate(BaseModel):
         return v
 
 
+class FinancialGoalBulkUpdateItem(FinancialGoalUpdate):
+    goal_id: UUID
+
+
+class FinancialGoalBulkDelete(BaseModel):
+    goal_ids: List[UUID]
+
+
 class FinancialGoalResponse(FinancialGoalBase):
     goal_id: UUID
     created_at: datetime
@@ -51,3 +59,34 @@ class FinancialGoalResponse(FinancialGoalBase):
 
     class Config:
         orm_mode = True
+
+
+class GoalProjection(BaseModel):
+    goal_id: UUID
+    goal_name: str
+    priority: PriorityEnum
+    target_date: date
+    months_remaining: int
+    target_amount: float
+    inflation_adjusted_target: float
+    required_monthly_contribution: float
+    success_probability: float
+    contribution_for_confidence: float
+
+
+class ProjectionAssumptions(BaseModel):
+    as_of: date
+    inflation: float
+    risk_profile: str
+    expected_return: float
+    volatility: float
+    paths: int
+    confidence: float
+    seed: int
+
+
+class GoalProjectionsResponse(BaseModel):
+    assumptions: ProjectionAssumptions
+    goals: List[GoalProjection]
+    total_required_monthly_contribution: float
+    total_contribution_for_confidence: float
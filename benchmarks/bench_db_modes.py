@@ -0,0 +1,54 @@
+"""
+Compare the sync (threadpool) and async (AsyncSession) backend modes.
+
+    python -m benchmarks.bench_db_modes --database-url sqlite:///./db_load.sqlite \\
+        --concurrency 64 --requests 5000
+
+Each mode runs benchmarks.db_load in its own process (the engine and route
+set are chosen at import) against the same database and workload; the
+table compares requests/sec and tail latency.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+
+def run_mode(mode, args, extra):
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, f"{mode}.json")
+        command = [
+            sys.executable, "-m", "benchmarks.db_load",
+            "--database-url", args.database_url,
+            "--concurrency", str(args.concurrency),
+            "--requests", str(args.requests),
+            "--output", output,
+            *extra,
+        ]
+        if mode == "async":
+            command.append("--async-db")
+        subprocess.run(command, check=True)
+        with open(output, encoding="utf-8") as f:
+            return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default="sqlite:///./db_load.sqlite")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5000)
+    args, extra = parser.parse_known_args()
+
+    results = {mode: run_mode(mode, args, extra) for mode in ("sync", "async")}
+    print(f"\n{'mode':6s} {'req/s':>9s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'max ms':>9s}")
+    for mode, result in results.items():
+        overall = result["overall"]
+        print(f"{mode:6s} {result['rps']:9.1f} {overall['p50_ms']:9.2f} {overall['p95_ms']:9.2f} "
+              f"{overall['p99_ms']:9.2f} {overall['max_ms']:9.2f}")
+    print(f"\nasync/sync throughput: {results['async']['rps'] / results['sync']['rps']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
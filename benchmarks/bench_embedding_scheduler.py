@@ -0,0 +1,74 @@
+"""
+Embedding throughput: fixed small batches vs the batching scheduler.
+
+    python -m benchmarks.bench_embedding_scheduler [--requests 200] [--rows 200] [--latency-ms 80]
+
+Uses a fake model whose calls cost a fixed latency plus a small per-text
+cost, then embeds:
+  - BigQuery-style row sets, the old way (sequential batches of 5) and
+    through the scheduler
+  - many concurrent single-query embeddings, one model call each vs
+    coalesced by the scheduler
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import save_results
+from benchmarks.fakes import FakeEmbeddingModel
+from shared.utils.embedding_scheduler import EmbeddingScheduler
+from shared.utils.embedding_utils import generate_batches
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200, help="Concurrent single-query requests")
+    parser.add_argument("--rows", type=int, default=200, help="Rows embedded per row-set request")
+    parser.add_argument("--row-sets", type=int, default=8, help="Concurrent row-set requests")
+    parser.add_argument("--latency-ms", type=float, default=80)
+    parser.add_argument("--output", default=None, help="Write JSON results to this path")
+    return parser.parse_args()
+
+
+def run(label, func, jobs, model, workers):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(func, jobs))
+    seconds = time.perf_counter() - started
+    texts = sum(len(job) for job in jobs)
+    result = {"seconds": seconds, "texts_per_second": texts / seconds, "model_calls": model.calls}
+    print(f"  {label:34s} {seconds:7.2f}s  {result['texts_per_second']:9.1f} texts/s  {model.calls:5d} calls")
+    return result
+
+
+def main():
+    args = parse_args()
+    results = {}
+    row_sets = [[f"row {i} {j}" for j in range(args.rows)] for i in range(args.row_sets)]
+    queries = [[f"query {i}"] for i in range(args.requests)]
+
+    print(f"{args.row_sets} concurrent row sets of {args.rows} texts")
+    model = FakeEmbeddingModel(args.latency_ms)
+
+    def batches_of_five(texts):
+        for batch in generate_batches(texts, batch_size=5):
+            model.get_embeddings(batch)
+
+    results["rows_batches_of_5"] = run("sequential batches of 5", batches_of_five, row_sets, model, args.row_sets)
+    model = FakeEmbeddingModel(args.latency_ms)
+    scheduler = EmbeddingScheduler(model)
+    results["rows_scheduler"] = run("scheduler", scheduler.embed, row_sets, model, args.row_sets)
+
+    print(f"{args.requests} concurrent single-query requests")
+    model = FakeEmbeddingModel(args.latency_ms)
+    results["queries_one_call_each"] = run("one call per query", model.get_embeddings, queries, model, 32)
+    model = FakeEmbeddingModel(args.latency_ms)
+    scheduler = EmbeddingScheduler(model)
+    results["queries_scheduler"] = run("scheduler", scheduler.embed, queries, model, 32)
+    results["scheduler_stats"] = scheduler.stats()
+    if args.output:
+        save_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
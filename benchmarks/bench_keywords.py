@@ -0,0 +1,82 @@
+"""
+Keyword extraction benchmark: full spaCy pipeline vs the fast path.
+
+    python -m benchmarks.bench_keywords [--queries N]
+
+Reports per-query latency, batch (nlp.pipe) throughput, memoized lookups,
+and memory for each mode. Queries come from the knowledge base titles.
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from benchmarks.common import max_rss_mb, percentile
+from shared.utils import nlp_utils
+from shared.utils.vector_index import load_knowledge_base
+
+
+def bench_mode(mode, queries):
+    rss_before = max_rss_mb()
+    started = time.perf_counter()
+    nlp = nlp_utils.get_nlp(mode)
+    load_ms = (time.perf_counter() - started) * 1000
+    rss_after = max_rss_mb()
+
+    latencies = []
+    tracemalloc.start()
+    for query in queries:
+        started = time.perf_counter()
+        nlp_utils.keywords_from_doc(nlp(query.lower()))
+        latencies.append((time.perf_counter() - started) * 1000)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    nlp_utils.extract_keywords_batch(queries, mode=mode)
+    batch_ms = (time.perf_counter() - started) * 1000
+
+    nlp_utils._cached_keywords.cache_clear()
+    for query in queries:
+        nlp_utils.extract_keywords(query, mode=mode)
+    started = time.perf_counter()
+    for query in queries:
+        nlp_utils.extract_keywords(query, mode=mode)
+    memo_us = (time.perf_counter() - started) * 1e6 / len(queries)
+
+    return {
+        "mode": mode,
+        "components": ",".join(nlp.pipe_names),
+        "load_ms": load_ms,
+        "model_rss_mb": rss_after - rss_before,
+        "per_query_mean_ms": statistics.mean(latencies),
+        "per_query_p50_ms": percentile(latencies, 50),
+        "per_query_p95_ms": percentile(latencies, 95),
+        "per_query_peak_kb": peak / 1024,
+        "batch_per_query_ms": batch_ms / len(queries),
+        "memoized_per_query_us": memo_us,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    titles = [record["title"] for record in load_knowledge_base().values()]
+    queries = (titles * (args.queries // len(titles) + 1))[: args.queries]
+
+    # "full" runs first so its RSS delta is not hidden by shared vocab/weights
+    results = [bench_mode("full", queries), bench_mode("fast", queries)]
+    for result in results:
+        print(f"\n== {result['mode']} ({result['components']})")
+        for key, value in result.items():
+            if key not in ("mode", "components"):
+                print(f"  {key:24s} {value:10.3f}")
+
+    full, fast = results
+    print(f"\nfast vs full per-query speedup: {full['per_query_mean_ms'] / fast['per_query_mean_ms']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
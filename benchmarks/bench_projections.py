@@ -0,0 +1,83 @@
+"""
+Goal projection benchmark.
+
+    python -m benchmarks.bench_projections [--goals 5 20 50] [--paths 1000 5000] [--repeat 20]
+
+Times the vectorized projection (inflation-adjusted targets, required
+contributions and Monte Carlo success odds) for one user with N goals
+spread over the next 30 years, against a per-goal, per-path Python loop
+for the smallest case.
+"""
+import argparse
+from datetime import date
+
+import numpy as np
+
+from benchmarks.common import save_results, timed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--goals", type=int, nargs="+", default=[5, 20, 50])
+    parser.add_argument("--paths", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", default=None, help="Write JSON results to this path")
+    return parser.parse_args()
+
+
+def make_goals(n_goals, today):
+    return [
+        {"goal_id": str(i), "goal_name": f"Goal {i}", "priority": "High", "target_amount": 100_000.0 * (i + 1),
+         "target_date": date(today.year + 1 + i % 30, today.month, 1)}
+        for i in range(n_goals)
+    ]
+
+
+def loop_success(goals, today, paths, seed=7, annual_return=0.10, volatility=0.12, inflation=0.06):
+    """
+    Reference implementation: simulate every goal and path month by month.
+    """
+    from backend.profile.financialgoals.projections import months_until, required_monthly_contributions
+
+    rng = np.random.default_rng(seed)
+    sigma = volatility / np.sqrt(12)
+    mu = np.log1p(annual_return) / 12 - sigma ** 2 / 2
+    out = []
+    for goal in goals:
+        months = int(months_until([goal["target_date"]], today)[0])
+        target = goal["target_amount"] * (1 + inflation) ** (months / 12)
+        monthly = float(required_monthly_contributions(np.array([target]), months, annual_return)[0])
+        hits = 0
+        for _ in range(paths):
+            wealth = 0.0
+            for _ in range(months):
+                wealth = wealth * np.exp(rng.normal(mu, sigma)) + monthly
+            hits += wealth >= target
+        out.append(hits / paths)
+    return out
+
+
+def main():
+    args = parse_args()
+    from backend.profile.financialgoals.projections import project_goals
+
+    today = date.today()
+    results = {"repeat": args.repeat}
+    for n_goals in args.goals:
+        goals = make_goals(n_goals, today)
+        for paths in args.paths:
+            results[f"vectorized_{n_goals}_goals_{paths}_paths"] = timed(
+                lambda: project_goals(goals, today=today, paths=paths), args.repeat
+            )
+    smallest = make_goals(min(args.goals), today)
+    results[f"python_loop_{len(smallest)}_goals_200_paths"] = timed(lambda: loop_success(smallest, today, 200), 1)
+
+    for name, stats in results.items():
+        if isinstance(stats, dict):
+            print(f"  {name:40s} p50={stats['p50_ms']:9.2f}ms  p95={stats['p95_ms']:9.2f}ms")
+    if args.output:
+        save_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
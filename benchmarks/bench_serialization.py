@@ -0,0 +1,125 @@
+"""
+Serialization benchmark for listing financial goals.
+
+    python -m benchmarks.bench_serialization [--goals 1000] [--repeat 50]
+
+Compares, for one user with N goals on an in-memory SQLite database:
+  - loading ORM entities vs selecting the response columns as plain rows
+  - pydantic response_model validation + json vs orjson on trusted rows
+  - the GET endpoint end to end: the old ORM/response_model route vs the
+    fast path (cold cache, warm cache and a 304 revalidation)
+"""
+import argparse
+import json
+import os
+from datetime import date, timedelta
+from typing import List
+
+from benchmarks.common import save_results, timed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--goals", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--output", default=None, help="Write JSON results to this path")
+    return parser.parse_args()
+
+
+def seed(n_goals):
+    from backend.dependencies import SessionLocal, engine
+    from backend.models import Base, UserProfile
+    from backend.profile.financialgoals.models import FinancialGoal, PriorityEnum
+
+    Base.metadata.create_all(bind=engine)
+    priorities = list(PriorityEnum)
+    with SessionLocal() as db:
+        db.add(UserProfile(id=1, first_name="Bench", last_name="User", age=30, annual_income=1_200_000,
+                           city="bangalore", occupation="engineer", dependents=1, risk_profile="moderate"))
+        db.flush()
+        db.add_all(
+            FinancialGoal(user_id=1, goal_name=f"Goal {i}", target_amount=1000.0 * (i + 1),
+                          target_date=date.today() + timedelta(days=1 + i % 3650),
+                          priority=priorities[i % len(priorities)])
+            for i in range(n_goals)
+        )
+        db.commit()
+
+
+def main():
+    args = parse_args()
+    os.environ["DATABASE_URL"] = "sqlite://"
+    os.environ["DB_ASYNC"] = "0"
+
+    import orjson
+    from fastapi import APIRouter, Depends, FastAPI
+    from fastapi.testclient import TestClient
+    from pydantic import TypeAdapter
+    from sqlalchemy.orm import Session
+
+    from backend.cache import api_cache
+    from backend.dependencies import SessionLocal, get_db
+    from backend.profile.financialgoals.api_router import api_router
+    from backend.profile.financialgoals.crud import get_goals_for_user
+    from backend.profile.financialgoals.models import FinancialGoal
+    from backend.profile.financialgoals.schemas import FinancialGoalResponse
+
+    seed(args.goals)
+    results = {"goals": args.goals, "repeat": args.repeat}
+
+    # --- Query: ORM entities vs response columns ---
+    with SessionLocal() as db:
+        def orm_query():
+            db.expunge_all()
+            return db.query(FinancialGoal).filter(FinancialGoal.user_id == 1).all()
+
+        results["query_orm_entities"] = timed(orm_query, args.repeat)
+        results["query_response_columns"] = timed(lambda: get_goals_for_user(db, 1), args.repeat)
+        entities = orm_query()
+        rows = get_goals_for_user(db, 1)
+
+    # --- Encoding: response_model validation + json vs orjson ---
+    adapter = TypeAdapter(List[FinancialGoalResponse])
+
+    def validated_json():
+        goals = adapter.validate_python(entities, from_attributes=True)
+        return json.dumps(adapter.dump_python(goals, mode="json")).encode("utf-8")
+
+    results["encode_validated_json"] = timed(validated_json, args.repeat)
+    results["encode_orjson_rows"] = timed(lambda: orjson.dumps(rows), args.repeat)
+
+    # --- End to end ---
+    legacy = APIRouter()
+
+    @legacy.get("/legacy/financial-goals/{user_id}", response_model=List[FinancialGoalResponse])
+    def legacy_read_goals(user_id: int, db: Session = Depends(get_db)):
+        return db.query(FinancialGoal).filter(FinancialGoal.user_id == user_id).all()
+
+    app = FastAPI()
+    app.include_router(api_router)
+    app.include_router(legacy)
+    client = TestClient(app)
+
+    def cold():
+        api_cache.invalidate("goals:1")
+        return client.get("/api/financial-goals/1")
+
+    results["http_legacy_orm_response_model"] = timed(lambda: client.get("/legacy/financial-goals/1"), args.repeat)
+    results["http_fast_cold_cache"] = timed(cold, args.repeat)
+    etag = client.get("/api/financial-goals/1").headers["etag"]
+    results["http_fast_warm_cache"] = timed(lambda: client.get("/api/financial-goals/1"), args.repeat)
+    results["http_fast_304"] = timed(
+        lambda: client.get("/api/financial-goals/1", headers={"If-None-Match": etag}), args.repeat
+    )
+    results["http_fast_page_500"] = timed(lambda: client.get("/api/financial-goals/1?limit=500"), args.repeat)
+
+    print(f"{args.goals} goals, {args.repeat} runs each")
+    for name, stats in results.items():
+        if isinstance(stats, dict):
+            print(f"  {name:32s} p50={stats['p50_ms']:8.2f}ms  p95={stats['p95_ms']:8.2f}ms")
+    if args.output:
+        save_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import json
+import os
+import resource
+import statistics
+import subprocess
+import time
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def summarize_latencies(latencies_ms):
+    """
+    Count, mean and p50/p95/p99/max of a list of latencies in milliseconds.
+    """
+    return {
+        "count": len(latencies_ms),
+        "mean_ms": statistics.mean(latencies_ms) if latencies_ms else 0.0,
+        "p50_ms": percentile(latencies_ms, 50),
+        "p95_ms": percentile(latencies_ms, 95),
+        "p99_ms": percentile(latencies_ms, 99),
+        "max_ms": max(latencies_ms, default=0.0),
+    }
+
+
+def timed(func, repeat):
+    """
+    Latency summary of ``repeat`` sequential calls to ``func``.
+    """
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return summarize_latencies(latencies)
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def save_results(results, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, default=str)
+    print(f"Saved results to {path}")
+
+
+def git_revision():
+    """
+    Short hash of the checked-out commit, suffixed with -dirty when tracked
+    files have uncommitted changes.
+    """
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                               text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{revision}-dirty" if dirty else revision
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,154 @@
+"""
+Load test for the backend profile and goals endpoints against a local database.
+
+    python -m benchmarks.db_load --database-url sqlite:///./db_load.sqlite \\
+        --concurrency 32 --requests 2000 --pool-size 5 --max-overflow 10
+
+Point --database-url at a local Postgres (postgresql://...) to size the pool
+under real concurrency. Requests go through the ASGI app in-process, so
+handler threads, sessions and pool checkouts behave as in production.
+Reports RPS, per-endpoint latency percentiles and pool utilization.
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+from benchmarks.common import max_rss_mb, save_results, summarize_latencies
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default="sqlite:///./db_load.sqlite")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--goals-per-user", type=int, default=10)
+    parser.add_argument("--pool-size", type=int, default=None)
+    parser.add_argument("--max-overflow", type=int, default=None)
+    parser.add_argument("--async-db", action="store_true", help="Serve routes from the AsyncSession CRUD layer")
+    parser.add_argument("--output", default=None, help="Write JSON results to this path")
+    return parser.parse_args()
+
+
+def configure_env(args):
+    # Must happen before backend.* is imported: the engine is built at import
+    os.environ["DATABASE_URL"] = args.database_url
+    if args.pool_size is not None:
+        os.environ["DB_POOL_SIZE"] = str(args.pool_size)
+    if args.max_overflow is not None:
+        os.environ["DB_MAX_OVERFLOW"] = str(args.max_overflow)
+    os.environ["DB_ASYNC"] = "1" if args.async_db else "0"
+
+
+def seed(users, goals_per_user):
+    from backend.dependencies import SessionLocal
+    from backend.models import UserProfile
+    from backend.profile.financialgoals.models import FinancialGoal, PriorityEnum
+
+    priorities = list(PriorityEnum)
+    with SessionLocal() as db:
+        db.query(FinancialGoal).delete()
+        db.query(UserProfile).delete()
+        db.add_all(
+            UserProfile(id=user_id, first_name=f"User{user_id}", last_name="Load", age=30,
+                        annual_income=1_200_000, city="bangalore", occupation="engineer",
+                        dependents=1, risk_profile="moderate")
+            for user_id in range(1, users + 1)
+        )
+        db.flush()
+        db.add_all(
+            FinancialGoal(user_id=user_id, goal_name=f"Goal {i}", target_amount=100_000 * (i + 1),
+                          target_date=date.today() + timedelta(days=90 * (i + 1)),
+                          priority=priorities[i % len(priorities)])
+            for user_id in range(1, users + 1)
+            for i in range(goals_per_user)
+        )
+        db.commit()
+
+
+def make_request(users):
+    """
+    Pick one operation, weighted towards the read-heavy page loads.
+    """
+    user_id = random.randint(1, users)
+    roll = random.random()
+    if roll < 0.45:
+        return "GET /api/profile/{id}", "GET", f"/api/profile/{user_id}", None
+    if roll < 0.9:
+        return "GET /api/financial-goals/{id}", "GET", f"/api/financial-goals/{user_id}", None
+    if roll < 0.95:
+        body = {"first_name": f"User{user_id}", "last_name": "Load", "age": 31,
+                "annual_income": 1_300_000, "city": "bangalore", "occupation": "engineer",
+                "dependents": 1, "risk_profile": "moderate"}
+        return "PUT /api/profile/{id}", "PUT", f"/api/profile/{user_id}", body
+    body = {"user_id": user_id, "goal_name": "Load goal", "target_amount": 50_000,
+            "target_date": str(date.today() + timedelta(days=365)), "priority": "Medium"}
+    return "POST /api/financial-goals/", "POST", "/api/financial-goals/", body
+
+
+async def run_load(app, args):
+    import httpx
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            name, method, url, body = make_request(args.users)
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.request(method, url, json=body)
+                latencies[name].append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors[f"{name} {response.status_code}"] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "elapsed_s": elapsed,
+        "rps": args.requests / elapsed,
+        "overall": summarize_latencies(all_latencies),
+        "endpoints": {name: summarize_latencies(values) for name, values in latencies.items()},
+        "errors": dict(errors),
+    }
+
+
+def main():
+    args = parse_args()
+    configure_env(args)
+
+    from backend.dependencies import get_pool_stats
+    from backend.main import app
+
+    seed(args.users, args.goals_per_user)
+    results = asyncio.run(run_load(app, args))
+    results["database_url"] = args.database_url.split("@")[-1]
+    results["mode"] = "async" if args.async_db else "sync"
+    results["pool"] = get_pool_stats()
+    results["max_rss_mb"] = max_rss_mb()
+
+    print(f"[{results['mode']}] {results['rps']:.1f} req/s over {results['elapsed_s']:.2f}s "
+          f"at concurrency {args.concurrency}")
+    for name, summary in sorted(results["endpoints"].items()):
+        print(f"  {name:34s} n={summary['count']:5d} p50={summary['p50_ms']:7.2f}ms "
+              f"p95={summary['p95_ms']:7.2f}ms p99={summary['p99_ms']:7.2f}ms")
+    print(f"  pool: {results['pool']}")
+    if results["errors"]:
+        print(f"  errors: {results['errors']}")
+    if args.output:
+        save_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
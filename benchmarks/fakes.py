@@ -0,0 +1,213 @@
+"""
+Local stand-ins for the remote services behind the finance agent.
+
+Each fake sleeps for a configurable latency so load tests see realistic
+overlap between requests without credentials or network access:
+
+  - FakeEmbeddingModel: deterministic hashed bag-of-words vectors, so texts
+    sharing words are similar (the semantic answer cache and vector search
+    behave like they do with real embeddings)
+  - FakeGenerativeModel: canned Gemini-style responses, streamed in chunks
+    (a model_factory for the shared GenerationClient)
+  - FakeBigQueryClient: serves the keyword query from finance_qa.jsonl
+  - FakeMarketDataProvider: seeded random-walk OHLC histories
+
+``install_finance_fakes`` wires them into the running finance agent. The
+SDK packages from requirements.txt still have to be importable.
+"""
+import hashlib
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from shared.utils.embedding_scheduler import Embedding
+from shared.utils.vector_index import KNOWLEDGE_BASE_PATH, load_knowledge_base
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+class FakeEmbeddingModel:
+    def __init__(self, latency_ms=60, per_text_ms=0.2, dim=768):
+        self.latency = latency_ms / 1000
+        self.per_text = per_text_ms / 1000
+        self.dim = dim
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def vector(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in _WORD_RE.findall(text.lower()):
+            digest = int(hashlib.md5(word.encode("utf-8")).hexdigest()[:8], 16)
+            vector[digest % self.dim] += 1.0 if digest & 1 << 31 else -1.0
+        if not vector.any():
+            vector[0] = 1.0
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def get_embeddings(self, texts):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency + self.per_text * len(texts))
+        return [Embedding(self.vector(text)) for text in texts]
+
+
+class FakeGenerativeModel:
+    """
+    Drop-in for ``vertexai.generative_models.GenerativeModel``; records the
+    longest prompt it was sent.
+
+    ``latency_ms`` is the time to the first chunk; streamed responses then
+    emit a chunk every ``chunk_ms``.
+    """
+
+    latency_ms = 600
+    chunk_ms = 20
+    chunks = 12
+
+    def __init__(self, model_name, **kwargs):
+        self.model_name = model_name
+        self.calls = 0
+        self.max_prompt_chars = 0
+        self._lock = threading.Lock()
+
+    def _text(self, prompt):
+        digest = hashlib.md5(prompt.encode("utf-8")).hexdigest()[:8]
+        return [f"Point {i} of answer {digest}. " for i in range(1, self.chunks + 1)]
+
+    def _stream(self, prompt):
+        time.sleep(self.latency_ms / 1000)
+        for i, text in enumerate(self._text(prompt)):
+            if i:
+                time.sleep(self.chunk_ms / 1000)
+            yield SimpleNamespace(text=text)
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        with self._lock:
+            self.calls += 1
+            self.max_prompt_chars = max(self.max_prompt_chars, len(prompt))
+        if stream:
+            return self._stream(prompt)
+        time.sleep((self.latency_ms + self.chunk_ms * (self.chunks - 1)) / 1000)
+        return SimpleNamespace(text="".join(self._text(prompt)))
+
+
+class FakeQueryJob:
+    """
+    Query job and its RowIterator in one: ``result()`` returns itself, and
+    the rows come back in pages of ``page_size``.
+    """
+
+    def __init__(self, df, job_id, total_bytes_processed, page_size=50):
+        self.job_id = job_id
+        self.total_bytes_processed = total_bytes_processed
+        self.total_rows = len(df)
+        self.schema = [SimpleNamespace(name=name) for name in df.columns]
+        self.page_size = page_size
+        self._df = df
+
+    def result(self):
+        return self
+
+    def to_dataframe(self):
+        return self._df
+
+    def to_dataframe_iterable(self):
+        for start in range(0, len(self._df), self.page_size):
+            yield self._df.iloc[start:start + self.page_size].reset_index(drop=True)
+
+
+class FakeBigQueryClient:
+    """
+    Answers ``FINANCIAL_DATA_QUERY`` from the local knowledge base: for each
+    keyword, rows whose tags match it, in keyword order, up to max_rows.
+    """
+
+    def __init__(self, kb_path=KNOWLEDGE_BASE_PATH, latency_ms=400, page_size=50):
+        self.latency = latency_ms / 1000
+        self.page_size = page_size
+        self.queries = []
+        self.rows = [(r["title"], r["answer_body"], r.get("tags") or "") for r in load_knowledge_base(kb_path).values()]
+        self.jobs = 0
+        self._lock = threading.Lock()
+
+    def query(self, sql, job_config=None):
+        with self._lock:
+            self.jobs += 1
+            job_id = f"fake-job-{self.jobs}"
+            self.queries.append(sql)
+        if getattr(job_config, "dry_run", False):
+            return FakeQueryJob(pd.DataFrame(), job_id, 0)
+        params = {param.name: param for param in getattr(job_config, "query_parameters", None) or []}
+        keywords = params["keywords"].values if "keywords" in params else []
+        max_rows = params["max_rows"].value if "max_rows" in params else len(self.rows)
+        time.sleep(self.latency)
+        rows = []
+        for keyword in keywords:
+            pattern = re.compile(keyword)
+            rows.extend((title, body, keyword) for title, body, tags in self.rows if pattern.search(tags))
+            if len(rows) >= max_rows:
+                break
+        df = pd.DataFrame(rows[:max_rows], columns=["input_text", "output_text", "category"])
+        return FakeQueryJob(df, job_id, sum(len(title) + len(body) for title, body, _ in self.rows), self.page_size)
+
+
+class FakeMarketDataProvider:
+    """
+    Business-day OHLCV history per symbol, seeded by the symbol so repeated
+    fetches agree.
+    """
+
+    def __init__(self, latency_ms=250, days=21):
+        self.latency = latency_ms / 1000
+        self.days = days
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def history(self, symbol, period="1mo"):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        rng = np.random.default_rng(int(hashlib.md5(symbol.encode("utf-8")).hexdigest()[:8], 16))
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.015, self.days)))
+        spread = close * rng.uniform(0.002, 0.02, self.days)
+        index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=self.days, tz="America/New_York")
+        return pd.DataFrame(
+            {
+                "Open": close * (1 + rng.normal(0, 0.004, self.days)),
+                "High": close + spread,
+                "Low": close - spread,
+                "Close": close,
+                "Volume": rng.integers(1_000_000, 5_000_000, self.days),
+            },
+            index=index,
+        )
+
+
+def install_finance_fakes(latency_scale=1.0, kb_path=KNOWLEDGE_BASE_PATH):
+    """
+    Point the finance agent's embedding model, BigQuery client, market data
+    provider and Gemini model at the fakes above; returns them by name.
+    """
+    from services.insights.finance_agent.agent_pipeline import qa_pipeline
+    from services.insights.stock_analysis.market_data import market_data
+    from shared.utils import bigquery_utils
+    from shared.utils.generation_client import generation_client
+
+    fakes = {
+        "embedding": FakeEmbeddingModel(latency_ms=60 * latency_scale, per_text_ms=0.2 * latency_scale),
+        "bigquery": FakeBigQueryClient(kb_path, latency_ms=400 * latency_scale),
+        "market_data": FakeMarketDataProvider(latency_ms=250 * latency_scale),
+        "generation": type("ScaledFakeGenerativeModel", (FakeGenerativeModel,), {
+            "latency_ms": FakeGenerativeModel.latency_ms * latency_scale,
+            "chunk_ms": FakeGenerativeModel.chunk_ms * latency_scale,
+        }),
+    }
+    qa_pipeline.embedding_model = fakes["embedding"]
+    bigquery_utils.bq_client = fakes["bigquery"]
+    market_data.provider = fakes["market_data"]
+    market_data.clear()
+    generation_client.set_model_factory(fakes["generation"])
+    return fakes
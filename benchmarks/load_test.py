@@ -0,0 +1,242 @@
+"""
+Offline load test for the backend and finance agent APIs.
+
+    python -m benchmarks.load_test [--scenarios ask ask_stream stocks profile goals] \\
+        [--concurrency 1 8 32] [--requests 200] [--latency-scale 1.0] \\
+        [--database-url sqlite:///./load_test.sqlite] [--baseline benchmarks/results/<rev>/load_test.json]
+
+Both apps run in-process behind httpx's ASGI transport. Vertex AI,
+BigQuery and yfinance are replaced by the fakes in benchmarks/fakes.py
+(--latency-scale 0 removes their sleeps to measure pure overhead), and the
+backend runs on SQLite or a local Postgres given with --database-url, so no
+credentials or network are needed. Each scenario runs once per concurrency
+level, starting from cold caches, and reports RPS, p50/p95/p99 latency,
+errors and peak RSS. Results are saved under benchmarks/results/<git
+revision>/ so runs from different commits can be compared with --baseline.
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+
+from benchmarks.common import git_revision, load_results, max_rss_mb, save_results, summarize_latencies
+
+SCENARIOS = ("ask", "ask_stream", "stocks", "profile", "goals")
+FINANCE_SCENARIOS = {"ask", "ask_stream", "stocks"}
+SYMBOLS = ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "RELIANCE.NS", "TCS.NS", "INFY.NS", "HDFCBANK.NS", "VOD.L"]
+# Questions the knowledge base does not cover, so they go to BigQuery
+OPEN_QUESTIONS = [
+    "Should I worry about inflation eating my savings?",
+    "How do bond yields react to interest rate hikes?",
+    "Is gold a good hedge during a recession?",
+    "What happens to my stocks if the broker goes bankrupt?",
+    "How are dividends from foreign companies taxed?",
+    "Is it better to prepay a loan or invest the money?",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario and concurrency level")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiplier for the fakes' latencies")
+    parser.add_argument("--questions", type=int, default=50, help="Distinct /ask questions (repeats hit caches)")
+    parser.add_argument("--qa-index", choices=["none", "fake"], default="none",
+                        help="none: lexical + BigQuery path; fake: vector index built with the fake model")
+    parser.add_argument("--database-url", default="sqlite:///./load_test.sqlite")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--goals-per-user", type=int, default=10)
+    parser.add_argument("--pool-size", type=int, default=None)
+    parser.add_argument("--max-overflow", type=int, default=None)
+    parser.add_argument("--async-db", action="store_true", help="Serve backend routes from the AsyncSession CRUD layer")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Defaults to benchmarks/results/<revision>/load_test.json")
+    parser.add_argument("--baseline", default=None, help="Earlier results file to compare against")
+    return parser.parse_args()
+
+
+def ask_questions(count, rng):
+    """
+    Knowledge base titles, reworded variants of them and open questions.
+    """
+    from shared.utils.vector_index import load_knowledge_base
+
+    titles = [record["title"] for record in load_knowledge_base().values()]
+    pool = []
+    for title in rng.sample(titles, min(count, len(titles))):
+        pool.append(rng.choice([title, f"Can you explain: {title.lower()}", f"{title} Keep it short."]))
+    pool[: len(OPEN_QUESTIONS)] = OPEN_QUESTIONS[:count]
+    return pool
+
+
+def request_factories(args, rng):
+    """
+    Scenario -> function(rng) returning (method, url, json body or None).
+    """
+    questions = ask_questions(args.questions, rng)
+    users = args.users
+
+    def profile(rng):
+        user_id = rng.randint(1, users)
+        if rng.random() < 0.9:
+            return "GET", f"/api/profile/{user_id}", None
+        return "PUT", f"/api/profile/{user_id}", {
+            "first_name": f"User{user_id}", "last_name": "Load", "age": 31, "annual_income": 1_300_000,
+            "city": "bangalore", "occupation": "engineer", "dependents": 1, "risk_profile": "moderate",
+        }
+
+    def goals(rng):
+        user_id = rng.randint(1, users)
+        roll = rng.random()
+        if roll < 0.7:
+            return "GET", f"/api/financial-goals/{user_id}", None
+        if roll < 0.8:
+            return "GET", f"/api/financial-goals/{user_id}?limit=5&sort=-target_date", None
+        if roll < 0.9:
+            return "GET", f"/api/financial-goals/{user_id}/projections", None
+        return "POST", "/api/financial-goals/", {
+            "user_id": user_id, "goal_name": "Load goal", "target_amount": 50_000,
+            "target_date": str(date.today() + timedelta(days=365)), "priority": "Medium",
+        }
+
+    return {
+        "ask": lambda rng: ("POST", "/ask", {"question": rng.choice(questions)}),
+        "ask_stream": lambda rng: ("POST", "/ask/stream", {"question": rng.choice(questions)}),
+        "stocks": lambda rng: ("POST", "/stocks/compare", {"symbols": rng.sample(SYMBOLS, rng.randint(2, 4))}),
+        "profile": profile,
+        "goals": goals,
+    }
+
+
+def setup_finance(args):
+    from benchmarks.fakes import FakeEmbeddingModel, install_finance_fakes
+    from services.insights.finance_agent.agent_pipeline import qa_pipeline
+    from shared.utils.vector_index import build_index
+
+    fakes = install_finance_fakes(args.latency_scale)
+    # Never pick up an index built with the real model: dimensions differ
+    qa_pipeline.index_dir = tempfile.mkdtemp(prefix="load_test_index_")
+    if args.qa_index == "fake":
+        build_index(FakeEmbeddingModel(latency_ms=0, per_text_ms=0), index_dir=qa_pipeline.index_dir)
+    qa_pipeline.reload_index()
+    return fakes
+
+
+def reset_caches():
+    from backend.cache import LRUCacheBackend, set_cache_backend
+    from services.insights.finance_agent.agent_pipeline import qa_pipeline
+    from services.insights.stock_analysis.market_data import market_data
+    from shared.utils.embedding_cache import embedding_cache
+
+    qa_pipeline.answer_cache.clear()
+    embedding_cache.clear()
+    market_data.clear()
+    set_cache_backend(LRUCacheBackend())
+
+
+async def drive(app, make_request, requests, concurrency, rng):
+    import httpx
+
+    latencies = []
+    errors = defaultdict(int)
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=None) as client:
+        async def one():
+            method, url, body = make_request(rng)
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.request(method, url, json=body)
+                except Exception as exc:
+                    errors[type(exc).__name__] += 1
+                    return
+                latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors[str(response.status_code)] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "rps": requests / elapsed,
+        "latency": summarize_latencies(latencies),
+        "errors": dict(errors),
+        "max_rss_mb": max_rss_mb(),
+    }
+
+
+def compare(results, baseline):
+    """
+    Print RPS and p95 changes against an earlier run.
+    """
+    print(f"\nvs {baseline.get('revision', '?')}:")
+    for scenario, levels in results["runs"].items():
+        for level, run in levels.items():
+            before = baseline.get("runs", {}).get(scenario, {}).get(level)
+            if before is None:
+                continue
+            rps = (run["rps"] / before["rps"] - 1) * 100 if before["rps"] else 0.0
+            p95_before = before["latency"]["p95_ms"]
+            p95 = (run["latency"]["p95_ms"] / p95_before - 1) * 100 if p95_before else 0.0
+            print(f"  {scenario:10s} c={level:>3s}  rps {rps:+7.1f}%  p95 {p95:+7.1f}%")
+
+
+def main():
+    args = parse_args()
+    os.environ["WARM_UP_ON_STARTUP"] = "0"
+    from benchmarks.db_load import configure_env, seed
+
+    configure_env(args)
+
+    from backend.main import app as backend_app
+    from backend.models import Base
+    from backend.dependencies import engine
+
+    Base.metadata.create_all(bind=engine)
+    seed(args.users, args.goals_per_user)
+    rng = random.Random(args.seed)
+    factories = request_factories(args, rng)
+
+    finance_app = None
+    if FINANCE_SCENARIOS.intersection(args.scenarios):
+        from services.insights.finance_agent.main import app as finance_app
+
+        setup_finance(args)
+
+    revision = git_revision()
+    results = {
+        "revision": revision,
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "args": vars(args),
+        "runs": {},
+    }
+    for scenario in args.scenarios:
+        app = finance_app if scenario in FINANCE_SCENARIOS else backend_app
+        for concurrency in args.concurrency:
+            reset_caches()
+            run = asyncio.run(drive(app, factories[scenario], args.requests, concurrency,
+                                    random.Random(f"{args.seed}-{scenario}-{concurrency}")))
+            results["runs"].setdefault(scenario, {})[str(concurrency)] = run
+            latency = run["latency"]
+            print(f"  {scenario:10s} c={concurrency:<3d} {run['rps']:8.1f} req/s  p50={latency['p50_ms']:8.2f}ms "
+                  f"p95={latency['p95_ms']:8.2f}ms  p99={latency['p99_ms']:8.2f}ms  "
+                  f"rss={run['max_rss_mb']:.0f}MB" + (f"  errors={run['errors']}" if run["errors"] else ""))
+
+    save_results(results, args.output or os.path.join("benchmarks", "results", revision, "load_test.json"))
+    if args.baseline:
+        compare(results, load_results(args.baseline))
+
+
+if __name__ == "__main__":
+    main()
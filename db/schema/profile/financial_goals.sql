@@ -26,3 +26,6 @@ CREATE TABLE IF NOT EXISTS financial_goals (
 CREATE INDEX IF NOT EXISTS idx_financial_goals_user_id   ON financial_goals(user_id);
 CREATE INDEX IF NOT EXISTS idx_financial_goals_due_date  ON financial_goals(due_date);
 CREATE INDEX IF NOT EXISTS idx_financial_goals_category  ON financial_goals(category);
+-- Keyset pagination of a user's goals on (due_date, id), optionally per priority
+CREATE INDEX IF NOT EXISTS idx_financial_goals_user_due_date          ON financial_goals(user_id, due_date, id);
+CREATE INDEX IF NOT EXISTS idx_financial_goals_user_priority_due_date ON financial_goals(user_id, priority, due_date, id);
@@ -167,59 +167,53 @@ export function ProfilePage() {
       .catch(() => setGoalsError("Failed to delete goal"));
   };
 
-  // Save all goals at once (batch update/replace pattern)
+  // Save all goals at once: one bulk create and one bulk update, each a single transaction
   const handleSaveAllGoals = () => {
     setGoalsLoading(true);
     setGoalsError(null);
     // Separate new and existing goals
     const newGoals = goals.filter(g => !g.goal_id);
     const updateGoals = goals.filter(g => g.goal_id);
-    const requests = [
-      // Create new goals
-      ...newGoals.map(goal =>
-        fetch("http://localhost:8000/api/financial-goals/", {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({
-            user_id: userId,
-            goal_name: goal.goal_name,
-            target_amount: goal.target_amount,
-            target_date: goal.target_date,
-            priority: goal.priority,
-          }),
-        })
-          .then(async res => {
+    const sendBulk = (method: string, body: object[]) =>
+      body.length === 0
+        ? Promise.resolve([])
+        : fetch("http://localhost:8000/api/financial-goals/bulk", {
+            method,
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify(body),
+          }).then(async res => {
             if (!res.ok) throw new Error(await res.text());
             return res.json();
-          })
-      ),
-      // Update existing goals
-      ...updateGoals.map(goal =>
-        fetch(`http://localhost:8000/api/financial-goals/${goal.goal_id}`, {
-          method: "PUT",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({
-            user_id: userId,
-            goal_name: goal.goal_name,
-            target_amount: goal.target_amount,
-            target_date: goal.target_date,
-            priority: goal.priority,
-          }),
-        })
-          .then(async res => {
-            if (!res.ok) throw new Error(await res.text());
-            return res.json();
-          })
-      ),
-    ];
+          });
 
-    Promise.all(requests)
-      .then(() =>
-        // Refresh goals list
-        fetch(`http://localhost:8000/api/financial-goals/${userId}`)
-          .then(res => res.ok ? res.json() : [])
-          .then(data => setGoals(data.map((goal: FinancialGoal) => ({ ...goal, temp_id: undefined }))))
-      )
+    Promise.all([
+      // Create new goals
+      sendBulk("POST", newGoals.map(goal => ({
+        user_id: userId,
+        goal_name: goal.goal_name,
+        target_amount: goal.target_amount,
+        target_date: goal.target_date,
+        priority: goal.priority,
+      }))),
+      // Update existing goals
+      sendBulk("PUT", updateGoals.map(goal => ({
+        goal_id: goal.goal_id,
+        goal_name: goal.goal_name,
+        target_amount: goal.target_amount,
+        target_date: goal.target_date,
+        priority: goal.priority,
+      }))),
+    ])
+      // Both responses carry the saved rows, so no refetch is needed
+      .then(([created, updated]) => {
+        const saved = new Map<string, FinancialGoal>(
+          updated.map((goal: FinancialGoal) => [goal.goal_id as string, goal])
+        );
+        setGoals([
+          ...updateGoals.map(goal => saved.get(goal.goal_id as string) ?? goal),
+          ...created,
+        ].map((goal: FinancialGoal) => ({ ...goal, temp_id: undefined })));
+      })
       .catch(err => setGoalsError("Failed to save one or more goals: " + err.message))
       .finally(() => setGoalsLoading(false));
   };
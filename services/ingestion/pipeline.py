@@ -0,0 +1,398 @@
+"""
+Incremental knowledge base ingestion.
+
+    python -m services.ingestion.pipeline data/ingest/new_rows.jsonl [--chunk-size 1000] [--restart]
+
+Records are streamed from JSONL or CSV in chunks of ``chunk_size``. Each
+chunk is deduped by question_id and content hash against the ingestion
+state, only new or changed titles are embedded, and their vectors are
+appended to (or rewritten in place in) a working copy of the vector index
+without a rebuild. New and changed records are appended to the knowledge
+base JSONL, where the last line for a question_id wins.
+
+Readers never see a half-written index: vectors go to ``embeddings.f32.next``
+and ``publish`` swaps it over ``embeddings.f32`` with an atomic rename before
+rewriting ``ids.json``, so a reader's open memory map keeps the old file.
+Nothing is published until the index covers the whole knowledge base; with
+no prebuilt index, the first run embeds the existing knowledge base before
+the new file.
+
+State lives next to the index in ``ingest_state.sqlite``: the content hash
+and index row of every question_id, the committed index/knowledge base
+sizes, and a per-source checkpoint. A chunk is committed in one SQLite
+transaction after its vectors and records are on disk. If a run dies
+mid-chunk, whatever it wrote past the last commit is truncated on the next
+start, so it resumes at the last checkpoint without duplicating rows.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import time
+from itertools import islice
+
+import numpy as np
+
+from shared.utils.embedding_cache import embedding_cache
+from shared.utils.embedding_scheduler import EmbeddingScheduler
+from shared.utils.embedding_utils import encode_texts, generate_batches
+from shared.utils.retrieval_engine import normalize
+from shared.utils.vector_index import (
+    EMBEDDINGS_FILE,
+    IDS_FILE,
+    INDEX_DIR,
+    INGEST_STATE_FILE,
+    KNOWLEDGE_BASE_PATH,
+)
+
+INGEST_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", "1000"))
+# Texts per embedding request (text-embedding-005 accepts up to 250)
+INGEST_EMBED_BATCH = int(os.getenv("INGEST_EMBED_BATCH", "250"))
+# Working copy of embeddings.f32 that ingestion writes to until publish
+WORK_SUFFIX = ".next"
+
+
+def detect_format(path):
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_records(path, fmt=None):
+    """
+    Stream records from a JSONL or CSV file, one dict per line/row.
+
+    Malformed JSON lines yield None so record positions stay stable for
+    checkpointing.
+    """
+    fmt = fmt or detect_format(path)
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                yield None
+
+
+def content_hash(record):
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class KnowledgeBaseIngestor:
+    """
+    Appends new and changed knowledge base records to the vector index.
+    """
+
+    def __init__(self, model, index_dir=INDEX_DIR, kb_path=KNOWLEDGE_BASE_PATH,
+                 chunk_size=INGEST_CHUNK_SIZE, embed_batch_size=INGEST_EMBED_BATCH, cache=embedding_cache):
+        # A chunk's titles go out as parallel, retried batches of embed_batch_size
+        if not isinstance(model, EmbeddingScheduler):
+            model = EmbeddingScheduler(model, max_batch_size=embed_batch_size)
+        self.embedder = model
+        self.index_dir = index_dir
+        self.kb_path = kb_path
+        self.chunk_size = chunk_size
+        self.cache = cache
+        os.makedirs(index_dir, exist_ok=True)
+        self.embeddings_path = os.path.join(index_dir, EMBEDDINGS_FILE)
+        self.work_path = self.embeddings_path + WORK_SUFFIX
+        self.ids_path = os.path.join(index_dir, IDS_FILE)
+        self.db = sqlite3.connect(os.path.join(index_dir, INGEST_STATE_FILE), check_same_thread=False)
+        self.db.executescript(
+            "CREATE TABLE IF NOT EXISTS rows "
+            "(question_id TEXT PRIMARY KEY, content_hash TEXT NOT NULL, row INTEGER NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS checkpoints "
+            "(source TEXT PRIMARY KEY, records INTEGER NOT NULL, source_bytes INTEGER NOT NULL, "
+            "updated_at REAL NOT NULL);"
+        )
+        if self._meta("rows") is None:
+            self._bootstrap()
+        self._recover()
+
+    # --- state ---
+
+    def _meta(self, key, default=None):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, **values):
+        self.db.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [(key, json.dumps(value)) for key, value in values.items()],
+        )
+
+    @property
+    def rows(self):
+        return self._meta("rows", 0)
+
+    @property
+    def dim(self):
+        return self._meta("dim")
+
+    @property
+    def kb_indexed(self):
+        """
+        Whether every knowledge base record has a row in the index.
+        """
+        return self._meta("kb_indexed", False)
+
+    def _bootstrap(self):
+        """
+        Seed the state from an index built by ``vector_index.build_index``.
+
+        Without one the state starts empty and ``kb_indexed`` stays False
+        until the knowledge base itself has been ingested.
+        """
+        ids, dim = [], None
+        if os.path.exists(self.ids_path):
+            with open(self.ids_path, encoding="utf-8") as f:
+                sidecar = json.load(f)
+            ids, dim = sidecar["ids"], sidecar["dim"]
+        row_of = {question_id: row for row, question_id in enumerate(ids)}
+        kb_bytes = os.path.getsize(self.kb_path) if os.path.exists(self.kb_path) else 0
+        # A working copy left by a previous state (e.g. before a full rebuild) is stale
+        if os.path.exists(self.work_path):
+            os.remove(self.work_path)
+        with self.db:
+            if row_of and kb_bytes:
+                # Last line wins, matching load_knowledge_base
+                for batch in generate_batches(list(self._latest_kb_hashes(row_of).items()), 1000):
+                    self.db.executemany(
+                        "INSERT OR REPLACE INTO rows (question_id, content_hash, row) VALUES (?, ?, ?)",
+                        [(question_id, digest, row_of[question_id]) for question_id, digest in batch],
+                    )
+            self._set_meta(rows=len(ids), dim=dim, kb_bytes=kb_bytes, kb_indexed=bool(row_of) or not kb_bytes)
+
+    def _latest_kb_hashes(self, row_of):
+        hashes = {}
+        for record in read_records(self.kb_path, "jsonl"):
+            if record and record.get("question_id") in row_of:
+                hashes[record["question_id"]] = content_hash(record)
+        return hashes
+
+    def _recover(self):
+        """
+        Drop anything an interrupted chunk wrote after the last commit.
+        """
+        rows, dim, kb_bytes = self.rows, self.dim, self._meta("kb_bytes", 0)
+        if self._meta("pending", False):
+            if dim and os.path.exists(self.work_path):
+                committed = rows * dim * 4
+                if os.path.getsize(self.work_path) > committed:
+                    os.truncate(self.work_path, committed)
+            if os.path.exists(self.kb_path) and os.path.getsize(self.kb_path) > kb_bytes:
+                os.truncate(self.kb_path, kb_bytes)
+            with self.db:
+                self._set_meta(pending=False)
+        if rows and (os.path.exists(self.work_path) or self._published_rows() != rows):
+            self.publish()
+
+    def _published_rows(self):
+        if not os.path.exists(self.ids_path):
+            return 0
+        with open(self.ids_path, encoding="utf-8") as f:
+            return len(json.load(f)["ids"])
+
+    def _lookup(self, question_ids):
+        found = {}
+        # Stay under SQLite's bound-parameter limit
+        for batch in generate_batches(question_ids, 500):
+            placeholders = ",".join("?" * len(batch))
+            for question_id, digest, row in self.db.execute(
+                f"SELECT question_id, content_hash, row FROM rows WHERE question_id IN ({placeholders})", batch
+            ):
+                found[question_id] = (digest, row)
+        return found
+
+    def checkpoint(self, source):
+        row = self.db.execute(
+            "SELECT records, source_bytes FROM checkpoints WHERE source = ?", (source,)
+        ).fetchone()
+        return row if row else (0, 0)
+
+    # --- ingestion ---
+
+    def _embed(self, titles):
+        # Raises EmbeddingError on any failure, leaving the chunk uncommitted
+        vectors = encode_texts(self.embedder, titles, self.cache)
+        return normalize(np.asarray(vectors, dtype=np.float32))
+
+    def _write_vectors(self, vectors, rows):
+        """
+        Write one vector per target row into the working copy; rows >=
+        self.rows extend it. The first write after a publish copies the
+        live file, which readers may have memory mapped.
+        """
+        row_bytes = vectors.shape[1] * 4
+        if not os.path.exists(self.work_path) and os.path.exists(self.embeddings_path):
+            shutil.copyfile(self.embeddings_path, self.work_path)
+        mode = "r+b" if os.path.exists(self.work_path) else "w+b"
+        with open(self.work_path, mode) as f:
+            for vector, row in zip(vectors, rows):
+                f.seek(row * row_bytes)
+                f.write(vector.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _append_records(self, records):
+        with open(self.kb_path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return os.path.getsize(self.kb_path)
+
+    def _process_chunk(self, records, stats, append_to_kb):
+        latest = {}
+        for record in records:
+            if not record or not record.get("question_id") or not record.get("title"):
+                stats["skipped"] += 1
+                continue
+            if record["question_id"] in latest:
+                stats["duplicates"] += 1
+            latest[record["question_id"]] = record
+
+        existing = self._lookup(list(latest))
+        todo = []
+        for question_id, record in latest.items():
+            digest = content_hash(record)
+            known = existing.get(question_id)
+            if known is not None and known[0] == digest:
+                stats["unchanged"] += 1
+            else:
+                todo.append((question_id, record, digest))
+        if not todo:
+            return None
+
+        vectors = self._embed([record["title"] for _, record, _ in todo])
+        if self.dim is not None and vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match index dimension {self.dim}")
+        next_row = self.rows
+        assignments = []
+        for question_id, _, digest in todo:
+            known = existing.get(question_id)
+            if known is None:
+                assignments.append((question_id, digest, next_row))
+                next_row += 1
+                stats["new"] += 1
+            else:
+                assignments.append((question_id, digest, known[1]))
+                stats["changed"] += 1
+        # Marks the files as possibly ahead of the state until the chunk commits
+        with self.db:
+            self._set_meta(pending=True)
+        self._write_vectors(vectors, [row for _, _, row in assignments])
+        kb_bytes = self._append_records([record for _, record, _ in todo]) if append_to_kb else self._meta("kb_bytes", 0)
+        return assignments, next_row, vectors.shape[1], kb_bytes
+
+    def ingest(self, path, fmt=None, restart=False):
+        """
+        Ingest ``path`` from its checkpoint (or from the start with ``restart``).
+        """
+        started = time.perf_counter()
+        source = os.path.abspath(path)
+        source_bytes = os.path.getsize(source)
+        done, checkpoint_bytes = self.checkpoint(source)
+        if restart or source_bytes < checkpoint_bytes:
+            # Replaced or truncated files are read again; dedupe skips known rows
+            done = 0
+        # Re-ingesting the knowledge base file itself only (re)builds the index
+        append_to_kb = not (os.path.exists(self.kb_path) and os.path.samefile(source, self.kb_path))
+        stats = {"source": source, "resumed_from": done, "records": 0, "skipped": 0, "duplicates": 0,
+                 "unchanged": 0, "new": 0, "changed": 0, "chunks": 0}
+        if append_to_kb and not self.kb_indexed:
+            # Otherwise the published index would hold only the new rows and
+            # shadow the rest of the knowledge base
+            print(f"📚 Indexing the existing knowledge base before {path}")
+            stats["knowledge_base"] = self.ingest(self.kb_path)
+
+        records = islice(read_records(source, fmt), done, None)
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                break
+            result = self._process_chunk(chunk, stats, append_to_kb)
+            done += len(chunk)
+            with self.db:
+                if result:
+                    assignments, rows, dim, kb_bytes = result
+                    self.db.executemany(
+                        "INSERT OR REPLACE INTO rows (question_id, content_hash, row) VALUES (?, ?, ?)",
+                        assignments,
+                    )
+                    self._set_meta(rows=rows, dim=dim, kb_bytes=kb_bytes, pending=False)
+                self.db.execute(
+                    "INSERT OR REPLACE INTO checkpoints (source, records, source_bytes, updated_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (source, done, source_bytes, time.time()),
+                )
+            stats["records"] += len(chunk)
+            stats["chunks"] += 1
+            print(f"Ingested {done} records from {path} ({stats['new']} new, {stats['changed']} changed)")
+
+        if not append_to_kb and not self.kb_indexed:
+            with self.db:
+                self._set_meta(kb_indexed=True)
+        self.publish()
+        stats["rows"] = self.rows
+        stats["seconds"] = time.perf_counter() - started
+        return stats
+
+    def publish(self):
+        """
+        Swap the working copy in and rewrite ids.json from the committed
+        state, so readers see the new rows on their next load.
+
+        Does nothing until the index covers the knowledge base. The vectors
+        are replaced first: a reader that still gets the old ids.json maps
+        a prefix of the new file, whose rows keep their ids.
+        """
+        rows, dim = self.rows, self.dim
+        if not rows:
+            return
+        if not self.kb_indexed:
+            print(f"⚠️ Not publishing {self.index_dir}: the knowledge base is not fully indexed yet")
+            return
+        if os.path.exists(self.work_path):
+            os.replace(self.work_path, self.embeddings_path)
+        ids = [None] * rows
+        for question_id, row in self.db.execute("SELECT question_id, row FROM rows"):
+            ids[row] = question_id
+        tmp_path = self.ids_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"dim": dim, "ids": ids}, f)
+        os.replace(tmp_path, self.ids_path)
+
+    def close(self):
+        self.db.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", help="JSONL or CSV file with question_id, title, answer_body, ...")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None)
+    parser.add_argument("--chunk-size", type=int, default=INGEST_CHUNK_SIZE)
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint for this file")
+    parser.add_argument("--index-dir", default=INDEX_DIR)
+    parser.add_argument("--kb-path", default=KNOWLEDGE_BASE_PATH)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    from vertexai.language_models import TextEmbeddingModel
+
+    from shared.utils.config import init_vertex_ai
+
+    args = parse_args()
+    init_vertex_ai()
+    ingestor = KnowledgeBaseIngestor(TextEmbeddingModel.from_pretrained("text-embedding-005"),
+                                     index_dir=args.index_dir, kb_path=args.kb_path, chunk_size=args.chunk_size)
+    print(json.dumps(ingestor.ingest(args.path, args.format, restart=args.restart), indent=2))
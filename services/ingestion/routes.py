@@ -1,7 +1,74 @@
-from fastapi import APIRouter
+import os
+import threading
+
+from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+from pydantic import BaseModel
+
+from services.ingestion.pipeline import KnowledgeBaseIngestor
+from services.insights.finance_agent.agent_pipeline import qa_pipeline
+
+# Only files under this directory can be ingested through the API
+INGEST_DIR = os.getenv("INGEST_DIR", "data/ingest")
+
+router = APIRouter(prefix="/ingest", tags=["ingestion"])
+
+_lock = threading.Lock()
+_status = {"running": False, "last_run": None, "error": None}
+
+
+class IngestRequest(BaseModel):
+    path: str
+    format: Optional[str] = None
+    restart: bool = False
+
+
+def resolve_source(path):
+    root = os.path.realpath(INGEST_DIR)
+    source = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, source]) != root:
+        raise HTTPException(status_code=400, detail=f"Path must be inside {INGEST_DIR}")
+    if not os.path.isfile(source):
+        raise HTTPException(status_code=404, detail=f"File not found: {path}")
+    return source
+
+
+def run_ingestion(source, fmt, restart):
+    try:
+        ingestor = KnowledgeBaseIngestor(qa_pipeline.embedder, qa_pipeline.index_dir, qa_pipeline.kb_path)
+        try:
+            _status["last_run"] = ingestor.ingest(source, fmt, restart=restart)
+        finally:
+            ingestor.close()
+        qa_pipeline.reload_index()
+    except Exception as exc:
+        print(f"❌ Ingestion of {source} failed: {exc}")
+        _status["error"] = str(exc)
+    finally:
+        _status["running"] = False
 
-router = APIRouter()
 
 @router.get('/')
 def root():
     return {"message": "ingestion root endpoint"}
+
+
+@router.post('/', status_code=202)
+def start_ingestion(request: IngestRequest):
+    """
+    Ingest a JSONL/CSV file from INGEST_DIR in the background.
+    """
+    source = resolve_source(request.path)
+    with _lock:
+        if _status["running"]:
+            raise HTTPException(status_code=409, detail="An ingestion run is already in progress")
+        _status.update(running=True, error=None)
+    threading.Thread(target=run_ingestion, args=(source, request.format, request.restart),
+                     name="kb-ingestion", daemon=True).start()
+    return {"status": "started", "source": source}
+
+
+@router.get('/status')
+def ingestion_status():
+    return _status
@@ -1,35 +1,448 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 import pandas as pd
-from vertexai.language_models import TextEmbeddingModel
 
-from shared.utils.bigquery_utils import fetch_financial_data
+from shared.utils.bigquery_utils import fetch_financial_data, get_bq_client
 from shared.utils.config import init_vertex_ai
-from shared.utils.embedding_utils import generate_batches, encode_texts, compute_query_embedding, find_best_match
-from shared.utils.generation_utils import generate_response
-from shared.utils.nlp_utils import extract_keywords
+from shared.utils.embedding_cache import embedding_cache
+from shared.utils.embedding_scheduler import EmbeddingError, EmbeddingScheduler
+from shared.utils.embedding_utils import encode_texts, compute_query_embedding, find_top_k
+from shared.utils.generation_utils import generate_response, generate_response_stream
+from shared.utils.hybrid_retrieval import HYBRID_CANDIDATES, CONTEXT_TOP_K, format_qa, pack_context, reciprocal_rank_fusion
+from shared.utils.lexical_index import BM25Index
+from shared.utils.metrics import metrics, observe_stage, stage_timer, traced_call
+from shared.utils.nlp_utils import extract_keywords, get_nlp
+from shared.utils.semantic_cache import SemanticCache
+from shared.utils.startup import mark_warm, startup_stage
+from shared.utils.vector_index import INDEX_DIR, KNOWLEDGE_BASE_PATH, VectorIndex, load_knowledge_base
+
+# Blocking SDK calls (spaCy, BigQuery, Vertex) run on this many worker threads
+PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", "16"))
+# Per-stage timeouts in seconds for the async pipeline
+STAGE_TIMEOUTS = {
+    "keywords": float(os.getenv("KEYWORDS_TIMEOUT", "5")),
+    "fetch": float(os.getenv("FETCH_TIMEOUT", "30")),
+    "embed": float(os.getenv("EMBED_TIMEOUT", "10")),
+    # Local index / BM25 lookups; the first one also loads them from disk
+    "retrieve": float(os.getenv("RETRIEVE_TIMEOUT", "30")),
+    "generate": float(os.getenv("GENERATE_TIMEOUT", "60")),
+}
+NO_KEYWORDS_ANSWER = "No relevant keywords found in query."
+# Without a vector index, answer from the local knowledge base (skipping
+# BigQuery) when a BM25 hit covers at least this share of the query terms
+LEXICAL_MIN_COVERAGE = float(os.getenv("LEXICAL_MIN_COVERAGE", "0.75"))
 
 class QAPipeline:
-    def __init__(self):
-        init_vertex_ai()
-        self.embedding_model = TextEmbeddingModel.from_pretrained("text-embedding-005")
+    """
+    Retrieval + generation pipeline behind /ask.
+
+    Construction is cheap: the embedding model, local index and knowledge
+    base load on first use, or up front via ``warm_up``.
+    """
+
+    def __init__(self, index_dir=INDEX_DIR, kb_path=KNOWLEDGE_BASE_PATH, executor=None, answer_cache=None):
+        self.index_dir = index_dir
+        self.kb_path = kb_path
+        self._embedding_model = None
+        self._embedder = None
+        self._index = None
+        self._index_loaded = False
+        self._knowledge_base = {}
+        self._lexical_index = None
+        self._load_lock = threading.Lock()
+        self.executor = executor or ThreadPoolExecutor(max_workers=PIPELINE_WORKERS,
+                                                       thread_name_prefix="qa-pipeline")
+        # Answers for semantically equivalent questions are served from here
+        self.answer_cache = answer_cache if answer_cache is not None else SemanticCache()
+
+    @property
+    def embedding_model(self):
+        if self._embedding_model is None:
+            with self._load_lock:
+                if self._embedding_model is None:
+                    init_vertex_ai()
+                    with startup_stage("embedding_model"):
+                        from vertexai.language_models import TextEmbeddingModel
+
+                        self._embedding_model = TextEmbeddingModel.from_pretrained("text-embedding-005")
+        return self._embedding_model
+
+    @embedding_model.setter
+    def embedding_model(self, model):
+        self._embedding_model = model
+        if self._embedder is not None:
+            self._embedder.model = model
+
+    @property
+    def embedder(self):
+        """
+        Batching scheduler in front of the embedding model; concurrent
+        requests share its model calls.
+        """
+        if self._embedder is None:
+            model = self.embedding_model
+            with self._load_lock:
+                if self._embedder is None:
+                    self._embedder = EmbeddingScheduler(model)
+        return self._embedder
+
+    def embedder_stats(self):
+        return self._embedder.stats() if self._embedder is not None else None
+
+    def collect_metrics(self):
+        """
+        Cache and embedding scheduler counters for /metrics, read at scrape time.
+        """
+        answer = self.answer_cache.stats()
+        embeddings = embedding_cache.stats()
+        for cache, hits, misses in (("answer", answer["hits"], answer["misses"]),
+                                    ("embedding", embeddings["hits"] + embeddings["disk_hits"], embeddings["misses"])):
+            yield "fyza_cache_hits_total", "counter", "Cache lookups that hit", {"cache": cache}, hits
+            yield "fyza_cache_misses_total", "counter", "Cache lookups that missed", {"cache": cache}, misses
+        scheduler = self.embedder_stats()
+        if scheduler is not None:
+            for name in ("requests", "model_calls", "texts", "retries", "splits", "failed_texts"):
+                yield (f"fyza_embedding_scheduler_{name}_total", "counter", f"Embedding scheduler {name.replace('_', ' ')}",
+                       {}, scheduler[name])
+            yield "fyza_embedding_scheduler_queued", "gauge", "Texts waiting for a batch", {}, scheduler["queued"]
+
+    def _load_index(self):
+        with self._load_lock:
+            if not self._index_loaded:
+                # Prebuilt local index (python -m shared.utils.vector_index); falls back to BigQuery if absent
+                with startup_stage("vector_index"):
+                    index = VectorIndex.load_if_exists(self.index_dir)
+                knowledge_base, lexical_index = {}, None
+                if os.path.exists(self.kb_path):
+                    with startup_stage("knowledge_base"):
+                        knowledge_base = load_knowledge_base(self.kb_path)
+                    # BM25 over title/answer/tags; fused with vector hits, or
+                    # used alone to skip BigQuery when there is no index
+                    with startup_stage("lexical_index"):
+                        lexical_index = BM25Index.from_records(knowledge_base.values())
+                self._index = index
+                self._knowledge_base = knowledge_base
+                self._lexical_index = lexical_index
+                self._index_loaded = True
+
+    @property
+    def index(self):
+        if not self._index_loaded:
+            self._load_index()
+        return self._index
+
+    @property
+    def knowledge_base(self):
+        if not self._index_loaded:
+            self._load_index()
+        return self._knowledge_base
+
+    def reload_index(self):
+        """
+        Reload the index and knowledge base on next use (e.g. after ingestion).
+        Cached answers may cite replaced rows, so they are dropped too.
+        """
+        with self._load_lock:
+            self._index_loaded = False
+        self.answer_cache.clear()
+
+    @property
+    def lexical_index(self):
+        if not self._index_loaded:
+            self._load_index()
+        return self._lexical_index
+
+    @property
+    def uses_index(self):
+        return self.index is not None and len(self.index) > 0
+
+    def warm_up(self):
+        """
+        Load every heavy resource the request path needs.
+        """
+        self.embedder
+        if not self.uses_index:
+            get_nlp()
+            get_bq_client()
+        mark_warm()
 
     def prepare_data(self, keywords):
         df = fetch_financial_data(keywords)
         df = df.head(200)
-        all_embeddings = []
-        for batch in generate_batches(df.input_text.tolist(), batch_size=5):
-            all_embeddings.extend(encode_texts(self.embedding_model, batch))
-        df["embeddings"] = all_embeddings
+        try:
+            with stage_timer("embed_rows"):
+                df["embeddings"] = encode_texts(self.embedder, df.input_text.tolist())
+        except EmbeddingError as exc:
+            print(f"⚠️ Dropping {len(exc.errors)} rows that failed to embed: {exc}")
+            df["embeddings"] = exc.results
+            df = df[df.embeddings.notna()].reset_index(drop=True)
+            if df.empty:
+                raise
         return df
 
+    def context_from_rankings(self, rankings, source):
+        """
+        Fuse ranked (question_id, score) lists and pack the best knowledge
+        base entries into the context budget; returns (context, metadata),
+        or None when no ranked id is in the knowledge base.
+        """
+        knowledge_base = self.knowledge_base
+        fused, records, seen = [], [], set()
+        for question_id, score in reciprocal_rank_fusion(rankings):
+            record = knowledge_base.get(question_id)
+            if record is None:
+                # Index rows from a stale ids.json or a partial ingest
+                continue
+            # The knowledge base repeats some questions under several ids
+            title = record["title"].strip().lower()
+            if title in seen:
+                continue
+            seen.add(title)
+            fused.append((question_id, score))
+            records.append(record)
+            if len(records) == CONTEXT_TOP_K:
+                break
+        if not records:
+            return None
+        context, used, tokens = pack_context([format_qa(r["title"], r["answer_body"]) for r in records])
+        matches = [
+            {"question_id": question_id, "title": record["title"],
+             "question_link": record.get("question_link"), "score": score}
+            for (question_id, score), record in zip(fused[:used], records)
+        ]
+        metadata = {"source": source, **matches[0], "matches": matches, "context_tokens": tokens}
+        return context, metadata
+
+    def context_from_index(self, query_embedding, query_text=None):
+        """
+        Return (context, metadata) from the vector index, fused with BM25
+        hits for ``query_text`` when given; None if nothing matched.
+        """
+        with stage_timer("retrieve_index"):
+            rankings = [self.index.search(query_embedding, k=HYBRID_CANDIDATES)]
+            if query_text and self.lexical_index is not None:
+                lexical = self.lexical_index.search(query_text, k=HYBRID_CANDIDATES)
+                if lexical:
+                    rankings.append(lexical)
+            return self.context_from_rankings(rankings, "index")
+
+    def lexical_context(self, query_text):
+        """
+        (context, metadata) from BM25 alone, or None without a confident hit.
+        """
+        if self.lexical_index is None:
+            return None
+        with stage_timer("retrieve_lexical"):
+            hits = self.lexical_index.search(query_text, k=HYBRID_CANDIDATES, min_coverage=LEXICAL_MIN_COVERAGE)
+            return self.context_from_rankings([hits], "lexical") if hits else None
+
+    @staticmethod
+    def context_from_frame(data_df, query_embedding):
+        """
+        Return (context, metadata) for the best matches among fetched rows.
+        """
+        with stage_timer("similarity"):
+            indices, scores = find_top_k(query_embedding, data_df.embeddings.values, k=CONTEXT_TOP_K)
+        context, used, tokens = pack_context(
+            [format_qa(data_df.input_text[i], data_df.output_text[i]) for i in indices]
+        )
+        best = indices[0]
+        metadata = {
+            "source": "bigquery",
+            "title": data_df.input_text[best],
+            "category": data_df.category[best] if "category" in data_df else None,
+            "rows_considered": len(data_df),
+            "rows_used": used,
+            "score": float(scores[0]),
+            "context_tokens": tokens,
+        }
+        return context, metadata
+
     def generate_answer(self, query_text):
-        keywords = extract_keywords(query_text)
+        with stage_timer("embed"):
+            query_embedding = compute_query_embedding(self.embedder, query_text)
+        with stage_timer("answer_cache"):
+            cached = self.answer_cache.lookup(query_embedding)
+        if cached is not None:
+            return cached[0]
+
+        if self.uses_index:
+            retrieved = self.context_from_index(query_embedding, query_text)
+            if retrieved is None:
+                return NO_KEYWORDS_ANSWER
+            context, _ = retrieved
+        else:
+            retrieved = self.lexical_context(query_text)
+            if retrieved is None:
+                with stage_timer("keywords"):
+                    keywords = extract_keywords(query_text)
+                if not keywords:
+                    return NO_KEYWORDS_ANSWER
+                with stage_timer("fetch"):
+                    data_df = self.prepare_data(keywords)
+                if data_df.empty:
+                    return NO_KEYWORDS_ANSWER
+                retrieved = self.context_from_frame(data_df, query_embedding)
+            context, _ = retrieved
+
+        with stage_timer("generate"):
+            answer = generate_response(context, query_text)
+        self.answer_cache.store(query_embedding, query_text, answer)
+        return answer
+
+    async def run_stage(self, stage, func, *args):
+        """
+        Run a blocking call on the pipeline executor, bounded by the stage
+        timeout. The recorded stage time includes waiting for a worker.
+        """
+        loop = asyncio.get_running_loop()
+        with stage_timer(stage):
+            return await asyncio.wait_for(
+                loop.run_in_executor(self.executor, traced_call(partial(func, *args))),
+                timeout=STAGE_TIMEOUTS[stage],
+            )
+
+    async def iterate_stage(self, stage, func, *args):
+        """
+        Drain a blocking generator on the pipeline executor as an async iterator.
+
+        The stage timeout applies to the wait for each item. The producer
+        thread stops early if the consumer goes away.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        done = object()
+        stopped = threading.Event()
+
+        def produce():
+            try:
+                for item in func(*args):
+                    if stopped.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, item)
+            except Exception as exc:
+                loop.call_soon_threadsafe(queue.put_nowait, exc)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        loop.run_in_executor(self.executor, traced_call(produce))
+        try:
+            while True:
+                item = await asyncio.wait_for(queue.get(), timeout=STAGE_TIMEOUTS[stage])
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stopped.set()
+
+    async def afetch_rows(self, query_text):
+        keywords = await self.run_stage("keywords", extract_keywords, query_text)
         if not keywords:
-            return "No relevant keywords found in query."
+            return None
+        data_df = await self.run_stage("fetch", self.prepare_data, keywords)
+        # No row matched any keyword: nothing to rank
+        return None if data_df.empty else data_df
+
+    def embed_query(self, query_text):
+        # Resolves the embedder here too: the first call loads the model
+        return compute_query_embedding(self.embedder, query_text)
+
+    def local_retrieval(self, query_text):
+        """
+        Return (uses_index, lexical (context, metadata) or None). Blocking:
+        the first call loads the index, knowledge base and BM25 from disk.
+        """
+        if self.uses_index:
+            return True, None
+        return False, self.lexical_context(query_text)
+
+    async def aretrieve(self, query_text):
+        """
+        Return (query_embedding, cached, retrieved) for the query.
+
+        ``cached`` is an (answer, similarity) hit from the answer cache, in
+        which case retrieval is abandoned and ``retrieved`` is None. Otherwise
+        ``retrieved`` is (context, metadata), or None if the query has no
+        keywords or BigQuery returns no rows for them. Without a vector index
+        a confident BM25 hit answers locally; failing that, the BigQuery
+        keyword fetch runs concurrently with the query embedding. Index and
+        BM25 lookups run on the executor like the SDK calls. Raises
+        ``asyncio.TimeoutError`` when a stage overruns.
+        """
+        embedding_task = asyncio.ensure_future(
+            self.run_stage("embed", self.embed_query, query_text)
+        )
+        rows_task = None
+        try:
+            uses_index, local = await self.run_stage("retrieve", self.local_retrieval, query_text)
+            if not uses_index and local is None:
+                rows_task = asyncio.ensure_future(self.afetch_rows(query_text))
+            query_embedding = await embedding_task
+            with stage_timer("answer_cache"):
+                cached = self.answer_cache.lookup(query_embedding)
+            if cached is not None:
+                return query_embedding, cached, None
+            if uses_index:
+                retrieved = await self.run_stage("retrieve", self.context_from_index, query_embedding, query_text)
+                return query_embedding, None, retrieved
+            if local is not None:
+                return query_embedding, None, local
+            data_df = await rows_task
+        finally:
+            for task in (embedding_task, rows_task):
+                if task is not None and not task.done():
+                    task.cancel()
+        if data_df is None:
+            return query_embedding, None, None
+        return query_embedding, None, self.context_from_frame(data_df, query_embedding)
+
+    async def agenerate_answer(self, query_text):
+        """
+        Async variant of ``generate_answer`` that never blocks the event loop.
+        """
+        query_embedding, cached, retrieved = await self.aretrieve(query_text)
+        if cached is not None:
+            return cached[0]
+        if retrieved is None:
+            return NO_KEYWORDS_ANSWER
+        context, _ = retrieved
+        answer = await self.run_stage("generate", generate_response, context, query_text)
+        self.answer_cache.store(query_embedding, query_text, answer)
+        return answer
 
-        data_df = self.prepare_data(keywords)
-        query_embedding = compute_query_embedding(self.embedding_model, query_text)
-        index = find_best_match(query_embedding, data_df.embeddings.values)
-        context = f"Question: {data_df.input_text[index]}\nAnswer: {data_df.output_text[index]}"
-        return generate_response(context, query_text)
+    async def astream_answer(self, query_text):
+        """
+        Yield ("context", metadata) once retrieval finishes, then ("token", text)
+        for every chunk of the generated answer.
+        """
+        query_embedding, cached, retrieved = await self.aretrieve(query_text)
+        if cached is not None:
+            answer, similarity = cached
+            yield "context", {"source": "answer_cache", "similarity": similarity}
+            yield "token", answer
+            return
+        if retrieved is None:
+            yield "context", None
+            yield "token", NO_KEYWORDS_ANSWER
+            return
+        context, metadata = retrieved
+        yield "context", metadata
+        chunks = []
+        started = time.perf_counter()
+        async for text in self.iterate_stage("generate", generate_response_stream, context, query_text):
+            if not chunks:
+                observe_stage("first_token", time.perf_counter() - started)
+            chunks.append(text)
+            yield "token", text
+        observe_stage("generate", time.perf_counter() - started)
+        self.answer_cache.store(query_embedding, query_text, "".join(chunks))
 
 qa_pipeline = QAPipeline()
+metrics.register_collector(qa_pipeline.collect_metrics)
@@ -1,9 +1,41 @@
-from fastapi import FastAPI
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+
+from shared.utils.metrics import HTTP_REQUEST_SECONDS, SERVER_TIMING, metrics, server_timing, start_trace
+from shared.utils.startup import startup_report, startup_stage
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from services.insights.finance_agent.routes import router
-from services.insights.stock_analysis.routes import router as stock_router
+from fastapi.responses import PlainTextResponse
+
+with startup_stage("import_routes"):
+    from services.insights.finance_agent.agent_pipeline import qa_pipeline
+    from services.insights.finance_agent.routes import router
+    from services.insights.stock_analysis.routes import router as stock_router
+    from services.ingestion.routes import router as ingestion_router
+
+# Load models in the background after startup so /health answers immediately
+WARM_UP_ON_STARTUP = os.getenv("WARM_UP_ON_STARTUP", "1") == "1"
+
+
+def warm_up():
+    try:
+        with startup_stage("warm_up"):
+            qa_pipeline.warm_up()
+    except Exception as exc:
+        print(f"⚠️ Warm-up failed, resources will load on first request: {exc}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if WARM_UP_ON_STARTUP:
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    yield
 
-app = FastAPI(title="Finance Insights Agent")
+
+app = FastAPI(title="Finance Insights Agent", lifespan=lifespan)
 
 # ✅ Add CORS middleware
 origins = [
@@ -17,14 +49,50 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],    # Allow all HTTP methods
     allow_headers=["*"],    # Allow all headers
+    expose_headers=["Server-Timing"],
 )
 
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """
+    Request latency histogram, plus a Server-Timing header with per-stage
+    durations when SERVER_TIMING=1. Streaming responses only report the
+    stages finished before their headers were sent.
+    """
+    if not metrics.enabled:
+        return await call_next(request)
+    trace = start_trace()
+    started = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - started
+    route = request.scope.get("route")
+    HTTP_REQUEST_SECONDS.observe(elapsed, method=request.method,
+                                 route=route.path if route is not None else "unmatched",
+                                 status=response.status_code)
+    if SERVER_TIMING:
+        response.headers["Server-Timing"] = server_timing(trace, total=elapsed)
+    return response
+
 # Include routes
 app.include_router(router)
 app.include_router(stock_router)
+app.include_router(ingestion_router)
 
 
 # Optional health check
 @app.get("/health")
 def health_check():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+# Prometheus scrape endpoint: per-stage latency histograms, row/embedding counters, cache hits
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+# Startup-time breakdown (per-stage milliseconds) and warm-up state
+@app.get("/health/startup")
+def startup_health():
+    return startup_report()
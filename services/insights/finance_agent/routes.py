@@ -1,16 +1,70 @@
-from fastapi import APIRouter
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from services.insights.finance_agent.agent_pipeline import qa_pipeline
 from shared.schemas.question_schema import QuestionRequest, AnswerResponse
+from shared.utils.embedding_cache import embedding_cache
+from shared.utils.generation_client import GenerationOverloaded, generation_client
+from shared.utils.single_flight import SingleFlight, normalize_question
 
 router = APIRouter()
 
+# Identical questions asked while one is being answered share that answer
+ask_flight = SingleFlight("ask")
+
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
 
 @router.post("/ask", response_model=AnswerResponse)
 async def ask_question(request: QuestionRequest):
-    answer = qa_pipeline.generate_answer(request.question)
+    try:
+        answer = await ask_flight.do(normalize_question(request.question),
+                                     lambda: qa_pipeline.agenerate_answer(request.question))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out while answering the question")
+    except GenerationOverloaded as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"})
     return AnswerResponse(question=request.question, answer=answer)
 
 
+@router.post("/ask/stream")
+async def ask_question_stream(request: QuestionRequest):
+    """
+    Server-sent events: one ``context`` event with the retrieved match,
+    ``token`` events as the answer is generated, then ``done``.
+    """
+    async def events():
+        try:
+            async for event, data in qa_pipeline.astream_answer(request.question):
+                yield sse_event(event, {"text": data} if event == "token" else data)
+        except asyncio.TimeoutError:
+            yield sse_event("error", {"detail": "Timed out while answering the question"})
+        except GenerationOverloaded as exc:
+            yield sse_event("error", {"detail": str(exc)})
+        yield sse_event("done", {"question": request.question})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/ask/cache/stats")
+def cache_stats():
+    return {
+        "answer_cache": qa_pipeline.answer_cache.stats(),
+        "embedding_cache": embedding_cache.stats(),
+        "embedding_scheduler": qa_pipeline.embedder_stats(),
+        "single_flight": ask_flight.stats(),
+        "generation": generation_client.stats(),
+    }
+
+
 @router.get("/health")
 def health_check():
     return {"status": "ok"}
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+# Column order and prompt headers for the compact feature table
+FEATURE_LABELS = {
+    "last_close": "close",
+    "return_1d": "ret1d%",
+    "return_5d": "ret5d%",
+    "return_period": "retPer%",
+    "volatility_ann": "volAnn%",
+    "ma_5": "ma5",
+    "ma_20": "ma20",
+    "close_vs_ma_20": "vsMa20%",
+    "max_drawdown": "maxDD%",
+    "volume_z": "volZ",
+}
+PERCENT_FEATURES = {"return_1d", "return_5d", "return_period", "volatility_ann", "close_vs_ma_20", "max_drawdown"}
+
+
+def _daily_index(hist):
+    index = pd.DatetimeIndex(hist.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
+
+
+def _wide(histories, column):
+    frames = {}
+    for symbol, hist in histories.items():
+        series = hist[column].copy()
+        series.index = _daily_index(hist)
+        frames[symbol] = series[~series.index.duplicated(keep="last")]
+    return pd.DataFrame(frames).sort_index()
+
+
+def compute_stock_features(histories):
+    """
+    Summary features for every symbol, computed column-wise in one pass.
+
+    ``histories`` maps symbol -> OHLCV DataFrame. Dates are aligned across
+    symbols, so exchanges with different holidays simply leave gaps.
+    Returns a DataFrame indexed by symbol with the ``FEATURE_LABELS`` columns.
+    """
+    if not histories:
+        return pd.DataFrame(columns=list(FEATURE_LABELS))
+    close = _wide(histories, "Close")
+    volume = _wide(histories, "Volume")
+    filled = close.ffill()
+    returns = close.pct_change(fill_method=None)
+
+    def lagged(n):
+        return filled.iloc[-n - 1] if len(filled) > n else pd.Series(np.nan, index=filled.columns)
+
+    last = filled.iloc[-1]
+    ma_20 = close.tail(20).mean()
+    features = pd.DataFrame({
+        "last_close": last,
+        "return_1d": last / lagged(1) - 1,
+        "return_5d": last / lagged(5) - 1,
+        "return_period": last / close.bfill().iloc[0] - 1,
+        "volatility_ann": returns.std() * np.sqrt(TRADING_DAYS),
+        "ma_5": close.tail(5).mean(),
+        "ma_20": ma_20,
+        "close_vs_ma_20": last / ma_20 - 1,
+        "max_drawdown": (filled / filled.cummax() - 1).min(),
+        "volume_z": (volume.ffill().iloc[-1] - volume.mean()) / volume.std().replace(0, np.nan),
+    })
+    features.index.name = "symbol"
+    return features
+
+
+def format_feature_table(features):
+    """
+    Render features as a small fixed-width table for the LLM prompt.
+    """
+    table = features[list(FEATURE_LABELS)].copy()
+    for column in PERCENT_FEATURES:
+        table[column] = table[column] * 100
+    table = table.rename(columns=FEATURE_LABELS)
+    return table.to_string(float_format=lambda value: f"{value:.2f}", na_rep="-")
+
+
+def features_to_json(features):
+    """
+    Plain {symbol: {feature: value}} dict with NaN mapped to None.
+    """
+    rounded = features.astype(float).round(6)
+    return {
+        symbol: {name: (None if pd.isna(value) else float(value)) for name, value in row.items()}
+        for symbol, row in rounded.iterrows()
+    }
@@ -0,0 +1,167 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, time as dtime, timedelta
+from zoneinfo import ZoneInfo
+
+MARKET_DATA_WORKERS = int(os.getenv("MARKET_DATA_WORKERS", "8"))
+# While a market is open the latest bar keeps moving, so cache briefly
+OPEN_MARKET_TTL = float(os.getenv("OPEN_MARKET_TTL", "300"))
+# Seconds a request waits for downloads; slower symbols are reported as timed out
+MARKET_DATA_TIMEOUT = float(os.getenv("MARKET_DATA_TIMEOUT", "10"))
+HISTORY_PERIOD = "1mo"
+
+# (timezone, open, close) per exchange suffix; anything else is treated as US
+MARKET_SESSIONS = {
+    ".NS": ("Asia/Kolkata", dtime(9, 15), dtime(15, 30)),
+    ".BO": ("Asia/Kolkata", dtime(9, 15), dtime(15, 30)),
+    ".L": ("Europe/London", dtime(8, 0), dtime(16, 30)),
+}
+DEFAULT_SESSION = ("America/New_York", dtime(9, 30), dtime(16, 0))
+
+
+def market_session(symbol):
+    for suffix, session in MARKET_SESSIONS.items():
+        if symbol.upper().endswith(suffix):
+            return session
+    return DEFAULT_SESSION
+
+
+def cache_expiry(symbol, now, open_ttl=OPEN_MARKET_TTL):
+    """
+    Unix time until which a history fetched at ``now`` stays fresh.
+
+    During trading hours that is ``open_ttl`` seconds (capped at the close);
+    otherwise data cannot change before the next weekday open. Exchange
+    holidays are not modelled, which only costs an extra refetch.
+    """
+    tz_name, open_at, close_at = market_session(symbol)
+    tz = ZoneInfo(tz_name)
+    local = datetime.fromtimestamp(now, tz)
+    close_dt = datetime.combine(local.date(), close_at, tz)
+    if local.weekday() < 5 and open_at <= local.time() < close_at:
+        return min(now + open_ttl, close_dt.timestamp())
+
+    day = local.date() if local.time() < open_at else local.date() + timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return datetime.combine(day, open_at, tz).timestamp()
+
+
+class YFinanceProvider:
+    """
+    Default data provider backed by yfinance.
+    """
+
+    def history(self, symbol, period=HISTORY_PERIOD):
+        import yfinance as yf
+
+        return yf.Ticker(symbol).history(period=period)
+
+
+class MarketDataService:
+    """
+    Concurrent, cached OHLC history lookups.
+
+    Symbols are downloaded on a bounded thread pool. Concurrent requests for
+    the same symbol share one in-flight download, and results are cached
+    per symbol until ``cache_expiry``. Any object with a
+    ``history(symbol, period)`` method returning a DataFrame can be used as
+    the provider.
+    """
+
+    def __init__(self, provider=None, max_workers=MARKET_DATA_WORKERS, open_ttl=OPEN_MARKET_TTL,
+                 period=HISTORY_PERIOD, clock=time.time, timeout=MARKET_DATA_TIMEOUT):
+        self.provider = provider or YFinanceProvider()
+        self.open_ttl = open_ttl
+        self.timeout = timeout
+        self.period = period
+        self.clock = clock
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="market-data")
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.timeouts = 0
+
+    def _download(self, symbol):
+        try:
+            history = self.provider.history(symbol, period=self.period)
+            with self._lock:
+                self._cache[symbol] = (history, cache_expiry(symbol, self.clock(), self.open_ttl))
+            return history
+        finally:
+            with self._lock:
+                self._inflight.pop(symbol, None)
+
+    def _future_for(self, symbol):
+        # Caller holds self._lock
+        future = self._inflight.get(symbol)
+        if future is not None:
+            self.shared += 1
+            return future
+        self.misses += 1
+        future = self.executor.submit(self._download, symbol)
+        self._inflight[symbol] = future
+        return future
+
+    def get_histories(self, symbols, timeout=None):
+        """
+        Return {symbol: DataFrame or Exception} for every requested symbol.
+
+        Waits at most ``timeout`` seconds (default ``self.timeout``) for
+        downloads; symbols still pending get a TimeoutError, while their
+        downloads carry on and fill the cache for later requests.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        now = self.clock()
+        results = {}
+        futures = {}
+        with self._lock:
+            for symbol in dict.fromkeys(symbols):
+                cached = self._cache.get(symbol)
+                if cached is not None and cached[1] > now:
+                    self.hits += 1
+                    results[symbol] = cached[0]
+                else:
+                    futures[symbol] = self._future_for(symbol)
+        wait(futures.values(), timeout=timeout)
+        timed_out = []
+        for symbol, future in futures.items():
+            if not future.done():
+                timed_out.append(symbol)
+                results[symbol] = TimeoutError(f"Timed out fetching {symbol} after {timeout:g}s")
+            elif future.exception() is not None:
+                results[symbol] = future.exception()
+            else:
+                results[symbol] = future.result()
+        if timed_out:
+            with self._lock:
+                self.timeouts += len(timed_out)
+            print(f"⏱️ Market data timed out after {timeout:g}s for: {', '.join(timed_out)}")
+        return results
+
+    def get_history(self, symbol):
+        result = self.get_histories([symbol])[symbol]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self):
+        return {
+            "cached_symbols": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_downloads": self.shared,
+            "timeouts": self.timeouts,
+        }
+
+
+market_data = MarketDataService()
@@ -1,13 +1,32 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from shared.schemas.stock_schemas import CompareStocksRequest
+from shared.utils.generation_client import GenerationOverloaded
+from shared.utils.single_flight import SingleFlight, normalize_symbols
+from services.insights.stock_analysis.market_data import market_data
 from services.insights.stock_analysis.stock_service import generate_stock_comparison
 
 router = APIRouter(prefix="/stocks", tags=["Stock Analysis"])
 
+# Concurrent comparisons of the same symbol set share one market data + Gemini call
+compare_flight = SingleFlight("stocks_compare")
+
 @router.post("/compare")
 async def compare_stocks_api(request: CompareStocksRequest):
-    answer = generate_stock_comparison(request.symbols)
-    return {"query": request.symbols, "analysis": answer}
+    # Every caller sharing a flight gets the same symbols back, whatever the
+    # casing or order the leader used
+    symbols = list(normalize_symbols(request.symbols))
+    # The comparison blocks on downloads and Gemini, so keep it off the event loop
+    try:
+        comparison = await compare_flight.do(tuple(symbols),
+                                             lambda: run_in_threadpool(generate_stock_comparison, symbols))
+    except GenerationOverloaded as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"})
+    return {"query": symbols, "analysis": comparison["analysis"], "metrics": comparison["metrics"]}
+
+@router.get("/stats")
+def stats():
+    return {"market_data": market_data.stats(), "single_flight": compare_flight.stats()}
 
 @router.get("/health")
 def health():
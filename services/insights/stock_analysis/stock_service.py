@@ -1,32 +1,54 @@
-import yfinance as yf
-from vertexai.generative_models import GenerativeModel
+from services.insights.stock_analysis.analytics import compute_stock_features, features_to_json, format_feature_table
+from services.insights.stock_analysis.market_data import market_data
+from shared.utils.generation_client import generation_client
 
 def fetch_stock_summary(symbol: str):
-    stock = yf.Ticker(symbol)
-    hist = stock.history(period="1mo")
+    hist = market_data.get_history(symbol)
     return hist.tail(5).to_dict()
 
-def compare_stocks(symbols: list[str]):
+def compare_stocks(symbols: list[str], service=None):
+    histories = (service or market_data).get_histories(symbols)
     result = {}
     for symbol in symbols:
-        try:
-            result[symbol] = fetch_stock_summary(symbol)
-        except Exception as e:
-            result[symbol] = f"Error fetching data: {e}"
+        hist = histories[symbol]
+        if isinstance(hist, Exception):
+            result[symbol] = f"Error fetching data: {hist}"
+        else:
+            result[symbol] = hist.tail(5).to_dict()
     return result
 
+def stock_metrics(symbols: list[str], service=None):
+    """
+    Return (features DataFrame, {symbol: error message}) for ``symbols``.
+    """
+    histories = (service or market_data).get_histories(symbols)
+    errors = {}
+    usable = {}
+    for symbol, hist in histories.items():
+        if isinstance(hist, Exception):
+            errors[symbol] = f"Error fetching data: {hist}"
+        elif hist.empty:
+            errors[symbol] = "No price data returned"
+        else:
+            usable[symbol] = hist
+    return compute_stock_features(usable), errors
+
 def generate_stock_comparison(symbols: list[str]):
+    """
+    Return {"analysis": LLM comparison text, "metrics": per-symbol features}.
+    """
     MAX_TOKENS= 1024
-    stock_data = compare_stocks(symbols)
-
-    prompt = f"You are finance Expert and need you to provide the very crisk response in 2-3 points. Compare the following stocks for the upcoming week: {symbols}.\nData: {stock_data}"
-
-    model = GenerativeModel("gemini-2.0-flash-lite-001")
-    response = model.generate_content(prompt, generation_config={"max_output_tokens": MAX_TOKENS})
-    return response.text
-
-
-
+    features, errors = stock_metrics(symbols)
 
+    data = format_feature_table(features)
+    if errors:
+        data += "\nUnavailable: " + "; ".join(f"{symbol}: {error}" for symbol, error in errors.items())
+    # Truncate only: compacting whitespace would shift the table's columns
+    data = generation_client.fit_context(data, compact=False)
 
+    prompt = f"You are finance Expert and need you to provide the very crisk response in 2-3 points. Compare the following stocks for the upcoming week: {symbols}.\nMetrics over the last month (returns, volatility and drawdown in %):\n{data}"
 
+    analysis = generation_client.generate(prompt, max_output_tokens=MAX_TOKENS)
+    metrics = features_to_json(features)
+    metrics.update({symbol: {"error": error} for symbol, error in errors.items()})
+    return {"analysis": analysis, "metrics": metrics}
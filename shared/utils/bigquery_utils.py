@@ -1,47 +1,111 @@
+import threading
+import time
+
+import numpy as np
 import pandas as pd
-from google.cloud import bigquery
 
 from shared.utils.config import authenticate
+from shared.utils.metrics import metrics, observe_stage
+from shared.utils.startup import startup_stage
+
+QUESTIONS_TABLE = "profound-actor-466504-u7.stackexchange_data.questions"
+MAX_ROWS = 200
+
+# One scan for every keyword: each keyword keeps the original per-keyword
+# REGEXP_CONTAINS semantics and results stay grouped in keyword order.
+FINANCIAL_DATA_QUERY = f"""
+SELECT q.title AS input_text, q.answer_body AS output_text, kw AS category
+FROM `{QUESTIONS_TABLE}` AS q, UNNEST(@keywords) AS kw WITH OFFSET AS kw_pos
+WHERE q.accepted_answer_id IS NOT NULL
+AND q.answer_body IS NOT NULL
+AND REGEXP_CONTAINS(q.tags, kw)
+AND q.score >= 100
+ORDER BY kw_pos
+LIMIT @max_rows
+"""
+
+ROWS_FETCHED = metrics.counter("fyza_bigquery_rows_fetched_total", "Rows returned by BigQuery queries")
+BYTES_PROCESSED = metrics.counter("fyza_bigquery_bytes_processed_total", "Bytes scanned by BigQuery queries")
+
+# Built on first use (see get_bq_client) so importing this module stays cheap
+bq_client = None
+_client_lock = threading.Lock()
 
-credentials, PROJECT_ID, _ = authenticate()
-bq_client = bigquery.Client(project = PROJECT_ID,
-                                credentials = credentials)
-def run_bq_query(sql):
+def get_bq_client():
+    global bq_client
+    if bq_client is None:
+        with _client_lock:
+            if bq_client is None:
+                with startup_stage("bigquery_client"):
+                    from google.cloud import bigquery
 
-    # Create BQ client
-    bq_client = bigquery.Client(project = PROJECT_ID,
-                                credentials = credentials)
+                    credentials, project_id, _ = authenticate()
+                    bq_client = bigquery.Client(project = project_id,
+                                                credentials = credentials)
+    return bq_client
 
+def frame_from_pages(rows):
+    """
+    Copy a query's result pages into one frame allocated up front.
+
+    ``rows.total_rows`` is known once the job is done, so each column is a
+    single preallocated array that pages are written into as they arrive,
+    instead of building a frame per page and concatenating them. Results
+    are capped at MAX_ROWS, so the pages come over the REST API; creating a
+    Storage Read API session would cost more than it saves at this size.
+    """
+    total = rows.total_rows
+    columns = {field.name: np.empty(total, dtype=object) for field in rows.schema}
+    filled = 0
+    for page in rows.to_dataframe_iterable():
+        end = min(filled + len(page), total)
+        for name, values in columns.items():
+            values[filled:end] = page[name].to_numpy()[: end - filled]
+        filled = end
+    df = pd.DataFrame({name: values[:filled] for name, values in columns.items()})
+    return df.infer_objects()
+
+def run_bq_query(sql, query_parameters=None, dry_run=True, client=None):
+    from google.cloud import bigquery
+
+    # Reuse the module-level client unless a stand-in is supplied
+    client = client or get_bq_client()
+
+    started = time.perf_counter()
     # Try dry run before executing query to catch any errors
-    job_config = bigquery.QueryJobConfig(dry_run=True,
-                                         use_query_cache=False)
-    bq_client.query(sql, job_config=job_config)
+    if dry_run:
+        job_config = bigquery.QueryJobConfig(dry_run=True,
+                                             use_query_cache=False,
+                                             query_parameters=query_parameters or [])
+        client.query(sql, job_config=job_config)
 
     # If dry run succeeds without errors, proceed to run query
-    job_config = bigquery.QueryJobConfig()
-    client_result = bq_client.query(sql,
-                                    job_config=job_config)
+    job_config = bigquery.QueryJobConfig(query_parameters=query_parameters or [])
+    client_result = client.query(sql,
+                                 job_config=job_config)
 
     job_id = client_result.job_id
 
-    # Wait for query/job to finish running. then get & return data frame
-    df = client_result.result().to_dataframe()
-    print(f"Finished job_id: {job_id}")
+    # Wait for query/job to finish running, then stream the pages into one frame
+    df = frame_from_pages(client_result.result())
+    elapsed = time.perf_counter() - started
+    observe_stage("bigquery", elapsed)
+    ROWS_FETCHED.inc(len(df))
+    bytes_processed = getattr(client_result, "total_bytes_processed", None) or 0
+    BYTES_PROCESSED.inc(bytes_processed)
+    print(f"Finished job_id: {job_id} ({len(df)} rows, {bytes_processed} bytes, {elapsed * 1000:.0f} ms)")
     return df
 
 
-def fetch_financial_data(financial_list):
-    se_df = pd.DataFrame()
-    for fin in financial_list:
-        query = f"""
-        SELECT title AS input_text, answer_body AS output_text 
-        FROM `profound-actor-466504-u7.stackexchange_data.questions` 
-        WHERE accepted_answer_id IS NOT NULL 
-        AND answer_body IS NOT NULL 
-        AND REGEXP_CONTAINS(tags, "{fin}") 
-        AND score >= 100;
-        """
-        language_df = run_bq_query(query)
-        language_df["category"] = fin
-        se_df = pd.concat([se_df, language_df], ignore_index=True)
-    return se_df
+def fetch_financial_data(financial_list, max_rows=MAX_ROWS, client=None):
+    keywords = list(dict.fromkeys(financial_list))
+    if not keywords:
+        return pd.DataFrame(columns=["input_text", "output_text", "category"])
+    from google.cloud import bigquery
+
+    query_parameters = [
+        bigquery.ArrayQueryParameter("keywords", "STRING", keywords),
+        bigquery.ScalarQueryParameter("max_rows", "INT64", max_rows),
+    ]
+    df = run_bq_query(FINANCIAL_DATA_QUERY, query_parameters, dry_run=False, client=client)
+    return df.reset_index(drop=True)
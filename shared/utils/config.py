@@ -1,38 +1,58 @@
 import os
-import vertexai
+import threading
 from google.auth import default
 from google.oauth2 import service_account
 
+from shared.utils.startup import startup_stage
+
 PROJECT_ID = "profound-actor-466504-u7"
 REGION = "us-central1"
 
 # Only use service_account.json if explicitly set
 SERVICE_ACCOUNT_FILE = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", None)
 
+_auth_lock = threading.Lock()
+_auth_result = None
+_vertex_ready = False
+
 def authenticate():
     """
     Authenticate using either:
       1. GOOGLE_APPLICATION_CREDENTIALS (local dev), or
       2. Application Default Credentials (Cloud Run).
+
+    Credentials are resolved once per process and reused afterwards.
     """
-    credentials = None
-
-    if SERVICE_ACCOUNT_FILE and os.path.exists(SERVICE_ACCOUNT_FILE):
-        print(f"🔑 Using local service account file: {SERVICE_ACCOUNT_FILE}")
-        credentials = service_account.Credentials.from_service_account_file(
-            SERVICE_ACCOUNT_FILE
-        )
-    else:
-        print("🌐 Using Application Default Credentials (Cloud Run).")
-        credentials, project_id = default()
-        global PROJECT_ID
-        if project_id:
-            PROJECT_ID = project_id
-
-    print(f"✅ Authenticated to project '{PROJECT_ID}' in region '{REGION}'")
-    return credentials, PROJECT_ID, REGION
+    global _auth_result, PROJECT_ID
+    with _auth_lock:
+        if _auth_result is not None:
+            return _auth_result
+
+        with startup_stage("authenticate"):
+            credentials = None
+
+            if SERVICE_ACCOUNT_FILE and os.path.exists(SERVICE_ACCOUNT_FILE):
+                print(f"🔑 Using local service account file: {SERVICE_ACCOUNT_FILE}")
+                credentials = service_account.Credentials.from_service_account_file(
+                    SERVICE_ACCOUNT_FILE
+                )
+            else:
+                print("🌐 Using Application Default Credentials (Cloud Run).")
+                credentials, project_id = default()
+                if project_id:
+                    PROJECT_ID = project_id
+
+        print(f"✅ Authenticated to project '{PROJECT_ID}' in region '{REGION}'")
+        _auth_result = (credentials, PROJECT_ID, REGION)
+        return _auth_result
 
 def init_vertex_ai():
+    global _vertex_ready
     credentials, project_id, region = authenticate()
-    vertexai.init(project=project_id, location=region, credentials=credentials)
-    return project_id, region
\ No newline at end of file
+    if not _vertex_ready:
+        with startup_stage("vertex_init"):
+            import vertexai
+
+            vertexai.init(project=project_id, location=region, credentials=credentials)
+        _vertex_ready = True
+    return project_id, region
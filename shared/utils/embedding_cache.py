@@ -0,0 +1,141 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "50000"))
+EMBEDDING_CACHE_TTL = float(os.getenv("EMBEDDING_CACHE_TTL", "0"))  # seconds, 0 = never expire
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH")  # SQLite file, unset = memory only
+
+
+class EmbeddingCache:
+    """
+    Content-hash keyed embedding cache.
+
+    Lookups hit an in-process LRU first and, when ``db_path`` is set, fall
+    back to a SQLite table so embeddings survive restarts. Vectors are kept
+    as float32 arrays and stored on disk as raw bytes.
+    """
+
+    def __init__(self, max_entries=EMBEDDING_CACHE_SIZE, ttl_seconds=EMBEDDING_CACHE_TTL,
+                 db_path=EMBEDDING_CACHE_PATH, namespace="text-embedding-005"):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def key(self, text):
+        return hashlib.sha256(f"{self.namespace}\x00{text}".encode("utf-8")).hexdigest()
+
+    def _expired(self, created_at, now):
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def _remember(self, key, vector, created_at):
+        self._entries[key] = (vector, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load_from_disk(self, keys, now):
+        found = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._db.execute(
+                f"SELECT key, vector, created_at FROM embeddings WHERE key IN ({placeholders})",
+                chunk,
+            ).fetchall()
+            for key, blob, created_at in rows:
+                if not self._expired(created_at, now):
+                    found[key] = (np.frombuffer(blob, dtype=np.float32), created_at)
+        return found
+
+    def get_many(self, texts):
+        """
+        Return one vector per text, ``None`` where the text is not cached.
+        """
+        now = time.time()
+        keys = [self.key(text) for text in texts]
+        results = [None] * len(texts)
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and not self._expired(entry[1], now):
+                    self._entries.move_to_end(key)
+                    results[i] = entry[0]
+                    self.hits += 1
+                else:
+                    missing.append(i)
+            if missing and self._db is not None:
+                found = self._load_from_disk([keys[i] for i in missing], now)
+                still_missing = []
+                for i in missing:
+                    if keys[i] in found:
+                        vector, created_at = found[keys[i]]
+                        self._remember(keys[i], vector, created_at)
+                        results[i] = vector
+                        self.disk_hits += 1
+                    else:
+                        still_missing.append(i)
+                missing = still_missing
+            self.misses += len(missing)
+        return results
+
+    def get(self, text):
+        return self.get_many([text])[0]
+
+    def put_many(self, texts, vectors):
+        now = time.time()
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                if vector is None:
+                    continue
+                key = self.key(text)
+                vector = np.asarray(vector, dtype=np.float32)
+                self._remember(key, vector, now)
+                rows.append((key, vector.tobytes(), now))
+            if rows and self._db is not None:
+                self._db.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)", rows)
+                self._db.commit()
+
+    def put(self, text, vector):
+        self.put_many([text], [vector])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM embeddings")
+                self._db.commit()
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+
+embedding_cache = EmbeddingCache()
@@ -0,0 +1,246 @@
+import os
+import queue
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from shared.utils.metrics import stage_timer
+
+# Texts per embedding request (text-embedding-005 accepts up to 250)
+EMBED_MAX_BATCH = int(os.getenv("EMBED_MAX_BATCH", "250"))
+# How long the first queued text waits for others to share its request
+EMBED_BATCH_WINDOW_MS = float(os.getenv("EMBED_BATCH_WINDOW_MS", "5"))
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+EMBED_RATE_LIMIT = float(os.getenv("EMBED_RATE_LIMIT", "0"))  # requests/second, 0 = unlimited
+EMBED_MAX_RETRIES = int(os.getenv("EMBED_MAX_RETRIES", "3"))
+EMBED_RETRY_BACKOFF = float(os.getenv("EMBED_RETRY_BACKOFF", "0.5"))  # seconds, doubled per attempt
+
+# HTTP statuses worth retrying (rate limited / server side); see is_retryable
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# Same shape as the Vertex TextEmbedding results callers already consume
+Embedding = namedtuple("Embedding", "values")
+
+
+class EmbeddingError(RuntimeError):
+    """
+    Raised when some texts could not be embedded.
+
+    ``errors`` maps input position -> exception; ``results`` holds the
+    vectors that did succeed (None at failed positions), so callers can
+    keep partial results instead of passing Nones downstream.
+    """
+
+    def __init__(self, errors, results):
+        first = next(iter(errors.values()))
+        super().__init__(f"{len(errors)} of {len(results)} texts failed to embed: {first!r}")
+        self.errors = errors
+        self.results = results
+
+
+def is_retryable(exc):
+    """
+    Transient failures (rate limits, timeouts, 5xx) are retried; anything
+    else is treated as a bad input and isolated by splitting the batch.
+    """
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    # google.api_core exceptions expose the HTTP status as ``code``
+    return getattr(exc, "code", None) in RETRYABLE_STATUS_CODES
+
+
+class RateLimiter:
+    """
+    Spaces calls at least 1/rate seconds apart across threads.
+    """
+
+    def __init__(self, rate, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = self.clock()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            self.sleep(start - now)
+
+
+class EmbeddingScheduler:
+    """
+    Batching front end for an embedding model.
+
+    Texts submitted from any thread are queued and coalesced into batches of
+    up to ``max_batch_size``; a batch goes out once it is full or
+    ``window_ms`` after its first text arrived. Up to ``concurrency`` batches
+    run in parallel under a shared rate limit. Transient errors are retried
+    with exponential backoff; other errors split the batch in halves until
+    the failing texts are isolated, so one bad input only fails itself.
+
+    Exposes ``get_embeddings(texts)`` like the model it wraps, so it can be
+    passed anywhere a model is expected (any object with that method works as
+    ``model``, which keeps it easy to drive with a fake).
+    """
+
+    def __init__(self, model, max_batch_size=EMBED_MAX_BATCH, window_ms=EMBED_BATCH_WINDOW_MS,
+                 concurrency=EMBED_CONCURRENCY, rate_limit=EMBED_RATE_LIMIT, max_retries=EMBED_MAX_RETRIES,
+                 backoff=EMBED_RETRY_BACKOFF, sleep=time.sleep):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.window = window_ms / 1000
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.sleep = sleep
+        self.rate_limiter = RateLimiter(rate_limit, sleep=sleep)
+        self._queue = queue.Queue()
+        self._slots = threading.Semaphore(concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="embed-batch")
+        self._dispatcher = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.calls = 0
+        self.texts = 0
+        self.retries = 0
+        self.splits = 0
+        self.failed = 0
+
+    def _ensure_started(self):
+        if self._dispatcher is None:
+            with self._start_lock:
+                if self._dispatcher is None:
+                    self._dispatcher = threading.Thread(target=self._dispatch_loop, name="embed-dispatch",
+                                                        daemon=True)
+                    self._dispatcher.start()
+
+    def _count(self, **increments):
+        with self._stats_lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    # --- batching ---
+
+    def _dispatch_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._slots.acquire()
+            # Texts that arrived while every worker was busy join this batch
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._executor.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch):
+        try:
+            results = self._embed_isolating([text for text, _ in batch])
+            for (_, future), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        except BaseException as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+        finally:
+            self._slots.release()
+
+    def _embed_isolating(self, texts):
+        """
+        Vectors (or the exception) per text; splits on non-transient errors.
+        """
+        try:
+            return self._call_with_retry(texts)
+        except Exception as exc:
+            if len(texts) == 1 or is_retryable(exc):
+                self._count(failed=len(texts))
+                return [exc] * len(texts)
+            self._count(splits=1)
+            middle = len(texts) // 2
+            return self._embed_isolating(texts[:middle]) + self._embed_isolating(texts[middle:])
+
+    def _call_with_retry(self, texts):
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            self._count(calls=1)
+            try:
+                with stage_timer("embedding_batch"):
+                    embeddings = self.model.get_embeddings(texts)
+                if len(embeddings) != len(texts):
+                    raise ValueError(f"Model returned {len(embeddings)} embeddings for {len(texts)} texts")
+                self._count(texts=len(texts))
+                return [embedding.values for embedding in embeddings]
+            except Exception as exc:
+                if attempt >= self.max_retries or not is_retryable(exc):
+                    raise
+                self._count(retries=1)
+                # Full jitter keeps parallel workers from retrying in lockstep
+                self.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+                attempt += 1
+
+    # --- public API ---
+
+    def submit(self, text):
+        """
+        Queue one text; returns a Future resolving to its vector.
+        """
+        self._ensure_started()
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, texts, timeout=None):
+        """
+        Vectors for ``texts`` in order; raises EmbeddingError if any failed.
+        """
+        self._count(requests=1)
+        futures = [self.submit(text) for text in texts]
+        done, _ = wait(futures, timeout=timeout)
+        results, errors = [], {}
+        for i, future in enumerate(futures):
+            if future not in done:
+                errors[i] = TimeoutError("Timed out waiting for embedding")
+                results.append(None)
+            elif future.exception() is not None:
+                errors[i] = future.exception()
+                results.append(None)
+            else:
+                results.append(future.result())
+        if errors:
+            raise EmbeddingError(errors, results)
+        return results
+
+    def get_embeddings(self, texts):
+        return [Embedding(values) for values in self.embed(texts)]
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "model_calls": self.calls,
+            "texts": self.texts,
+            "mean_batch_size": self.texts / self.calls if self.calls else 0.0,
+            "retries": self.retries,
+            "splits": self.splits,
+            "failed_texts": self.failed,
+            "queued": self._queue.qsize(),
+        }
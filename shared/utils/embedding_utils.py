@@ -1,21 +1,66 @@
-from vertexai.language_models import TextEmbeddingModel
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
+from shared.utils.embedding_cache import embedding_cache
+from shared.utils.embedding_scheduler import EmbeddingError
+from shared.utils.metrics import metrics
+from shared.utils.retrieval_engine import RETRIEVAL_ENGINE, create_engine
+
+EMBEDDINGS_COMPUTED = metrics.counter(
+    "fyza_embeddings_computed_total", "Texts embedded by the model (cache misses)", ("kind",)
+)
+
 def generate_batches(sentences, batch_size=5):
     for i in range(0, len(sentences), batch_size):
         yield sentences[i : i + batch_size]
 
-def encode_texts(model, sentences):
+def encode_texts(model, sentences, cache=embedding_cache):
+    """
+    Embed ``sentences``, only sending texts the cache has not seen to the model.
+
+    ``model`` is a TextEmbeddingModel or an EmbeddingScheduler. Failures
+    raise instead of returning None; an ``EmbeddingError`` carries the
+    vectors that did succeed (indexed like ``sentences``), and those are
+    still cached.
+    """
+    cached = cache.get_many(sentences) if cache is not None else [None] * len(sentences)
+    missing = [i for i, vector in enumerate(cached) if vector is None]
+    results = [None if vector is None else vector.tolist() for vector in cached]
+    if not missing:
+        return results
+    errors = {}
     try:
-        embeddings = model.get_embeddings(sentences)
-        return [embedding.values for embedding in embeddings]
-    except Exception:
-        return [None for _ in range(len(sentences))]
+        fresh = [embedding.values for embedding in model.get_embeddings([sentences[i] for i in missing])]
+    except EmbeddingError as exc:
+        fresh = exc.results
+        errors = {missing[i]: error for i, error in exc.errors.items()}
+    embedded = [(i, values) for i, values in zip(missing, fresh) if values is not None]
+    EMBEDDINGS_COMPUTED.inc(len(embedded), kind="rows")
+    if cache is not None and embedded:
+        cache.put_many([sentences[i] for i, _ in embedded], [values for _, values in embedded])
+    for i, values in embedded:
+        results[i] = values
+    if errors:
+        raise EmbeddingError(errors, results)
+    return results
+
+def compute_query_embedding(model, query_text, cache=embedding_cache):
+    if cache is not None:
+        cached = cache.get(query_text)
+        if cached is not None:
+            return cached.tolist()
+    values = model.get_embeddings([query_text])[0].values
+    EMBEDDINGS_COMPUTED.inc(kind="query")
+    if cache is not None:
+        cache.put(query_text, values)
+    return values
 
-def compute_query_embedding(model, query_text):
-    return model.get_embeddings([query_text])[0].values
+def find_top_k(query_embedding, embeddings, k=5, engine=RETRIEVAL_ENGINE):
+    """
+    Return (indices, scores) of the ``k`` rows most similar to the query.
+    """
+    matrix = np.asarray(list(embeddings), dtype=np.float32)
+    return create_engine(matrix, engine).search(query_embedding, k)
 
 def find_best_match(query_embedding, embeddings):
-    cos_sim_array = cosine_similarity([query_embedding], list(embeddings))
-    return np.argmax(cos_sim_array)
+    indices, _ = find_top_k(query_embedding, embeddings, k=1, engine="exact")
+    return indices[0]
@@ -0,0 +1,179 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from shared.utils.hybrid_retrieval import CONTEXT_TOKEN_BUDGET, compact_text, truncate_to_tokens
+from shared.utils.metrics import metrics, observe_stage
+
+GENERATION_MODEL = os.getenv("GENERATION_MODEL", "gemini-2.0-flash-lite-001")
+# Generations running at once; further calls queue for a slot
+GENERATION_CONCURRENCY = int(os.getenv("GENERATION_CONCURRENCY", "8"))
+# Calls allowed to wait for a slot; beyond this they are shed immediately
+GENERATION_MAX_QUEUE = int(os.getenv("GENERATION_MAX_QUEUE", "32"))
+# Seconds a queued call waits for a slot before it is shed
+GENERATION_QUEUE_TIMEOUT = float(os.getenv("GENERATION_QUEUE_TIMEOUT", "10"))
+GENERATION_MAX_OUTPUT_TOKENS = int(os.getenv("GENERATION_MAX_OUTPUT_TOKENS", "1024"))
+
+GENERATIONS_SHED = metrics.counter(
+    "fyza_generations_shed_total", "Generations rejected because the client was saturated", ("reason",)
+)
+
+
+class GenerationOverloaded(RuntimeError):
+    """
+    Raised instead of queueing when every generation slot is busy and the
+    queue is full, or a queued call waited longer than the queue timeout.
+    """
+
+
+def vertex_model(name):
+    from vertexai.generative_models import GenerativeModel
+
+    return GenerativeModel(name)
+
+
+class GenerationClient:
+    """
+    Shared front end for the Gemini model.
+
+    Model handles are created once per model name and reused. At most
+    ``max_concurrency`` generations run at a time (a stream holds its slot
+    until it is exhausted or closed); up to ``max_queue`` more wait up to
+    ``queue_timeout`` seconds, and the rest fail fast with
+    ``GenerationOverloaded`` so callers can shed load instead of piling up.
+
+    ``model_factory(name)`` builds the handles; pass a fake to run without
+    Vertex AI.
+    """
+
+    def __init__(self, model_name=GENERATION_MODEL, max_concurrency=GENERATION_CONCURRENCY,
+                 max_queue=GENERATION_MAX_QUEUE, queue_timeout=GENERATION_QUEUE_TIMEOUT,
+                 context_tokens=CONTEXT_TOKEN_BUDGET, max_output_tokens=GENERATION_MAX_OUTPUT_TOKENS,
+                 model_factory=vertex_model):
+        self.model_name = model_name
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.context_tokens = context_tokens
+        self.max_output_tokens = max_output_tokens
+        self.model_factory = model_factory
+        self._models = {}
+        self._models_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.max_concurrency = max_concurrency
+        self.active = 0
+        self.queued = 0
+        self.completed = 0
+        self.shed = 0
+
+    def set_model_factory(self, model_factory):
+        with self._models_lock:
+            self.model_factory = model_factory
+            self._models.clear()
+
+    def model(self, name=None):
+        name = name or self.model_name
+        model = self._models.get(name)
+        if model is None:
+            with self._models_lock:
+                model = self._models.get(name)
+                if model is None:
+                    model = self._models[name] = self.model_factory(name)
+        return model
+
+    def _reject(self, reason):
+        with self._lock:
+            self.shed += 1
+        GENERATIONS_SHED.inc(reason=reason)
+        raise GenerationOverloaded(f"Generation capacity exhausted ({reason}); retry shortly")
+
+    @contextmanager
+    def slot(self):
+        """
+        Hold one generation slot, queueing or shedding as configured.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                full = self.queued >= self.max_queue
+                if not full:
+                    self.queued += 1
+            if full:
+                self._reject("queue_full")
+            started = time.perf_counter()
+            try:
+                acquired = self._slots.acquire(timeout=self.queue_timeout)
+            finally:
+                with self._lock:
+                    self.queued -= 1
+            observe_stage("generation_queue", time.perf_counter() - started)
+            if not acquired:
+                self._reject("queue_timeout")
+        with self._lock:
+            self.active += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+            self._slots.release()
+
+    def fit_context(self, context, max_tokens=None, compact=True):
+        """
+        Truncate ``context`` to the context token budget (CONTEXT_TOKEN_BUDGET,
+        the one pack_context applies to retrieved /ask context). HTML and
+        runs of spaces are dropped first unless ``compact`` is False, which
+        keeps preformatted text such as fixed-width tables aligned.
+        """
+        if compact:
+            context = compact_text(context)
+        return truncate_to_tokens(context, max_tokens or self.context_tokens)
+
+    def _config(self, max_output_tokens):
+        return {"max_output_tokens": max_output_tokens or self.max_output_tokens}
+
+    def generate(self, prompt, max_output_tokens=None, model_name=None):
+        with self.slot():
+            response = self.model(model_name).generate_content(
+                prompt, generation_config=self._config(max_output_tokens)
+            )
+        return response.text
+
+    def stream(self, prompt, max_output_tokens=None, model_name=None):
+        """
+        Yield the response text chunk by chunk as the model produces it.
+        """
+        with self.slot():
+            chunks = self.model(model_name).generate_content(
+                prompt, generation_config=self._config(max_output_tokens), stream=True
+            )
+            for chunk in chunks:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunks without text parts (e.g. a final safety/finish chunk)
+                    continue
+                if text:
+                    yield text
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "active": self.active,
+                "queued": self.queued,
+                "completed": self.completed,
+                "shed": self.shed,
+                "models": list(self._models),
+            }
+
+    def collect_metrics(self):
+        stats = self.stats()
+        yield "fyza_generations_active", "gauge", "Generations holding a slot", {}, stats["active"]
+        yield "fyza_generations_queued", "gauge", "Generations waiting for a slot", {}, stats["queued"]
+        yield "fyza_generations_completed_total", "counter", "Generations that held a slot", {}, stats["completed"]
+
+
+generation_client = GenerationClient()
+metrics.register_collector(generation_client.collect_metrics)
@@ -1,7 +1,9 @@
-from vertexai.generative_models import GenerativeModel
+from shared.utils.generation_client import generation_client
 
-def generate_response(context, query_text):
-    prompt = f"""
+
+def build_prompt(context, query_text):
+    # ``context`` comes from pack_context, already compacted and within the token budget
+    return f"""
     Here is the context: {context}
 
     Using the relevant information from the context,
@@ -11,6 +13,12 @@ def generate_response(context, query_text):
     answer with:
     [I couldn't find a good match in the document database for your query]
     """
-    model = GenerativeModel("gemini-2.0-flash-lite-001")
-    response = model.generate_content(prompt)
-    return response.text
+
+def generate_response(context, query_text):
+    return generation_client.generate(build_prompt(context, query_text))
+
+def generate_response_stream(context, query_text):
+    """
+    Yield the answer text chunk by chunk as Gemini produces it.
+    """
+    yield from generation_client.stream(build_prompt(context, query_text))
@@ -0,0 +1,84 @@
+import html
+import math
+import os
+import re
+
+# Candidates taken from each retriever before fusion
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "20"))
+# Reciprocal rank fusion constant; larger values flatten the rank curve
+RRF_K = int(os.getenv("RRF_K", "60"))
+# Most entries and approximate tokens of retrieved context sent to the LLM
+CONTEXT_TOP_K = int(os.getenv("CONTEXT_TOP_K", "5"))
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1200"))
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACES_RE = re.compile(r"[^\S\n]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+def reciprocal_rank_fusion(rankings, k=RRF_K, weights=None):
+    """
+    Fuse ranked [(id, score), ...] lists into one list of (id, fused score).
+
+    Each list contributes weight / (k + rank) per id, so retrievers with
+    incomparable score scales (cosine vs BM25) can be combined.
+    """
+    weights = weights or [1.0] * len(rankings)
+    fused = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, (doc_id, _) in enumerate(ranking, start=1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + weight / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+def estimate_tokens(text):
+    # ~4 characters per token for English text
+    return math.ceil(len(text) / 4)
+
+
+def compact_text(text):
+    """
+    Drop HTML markup (BigQuery answer bodies are HTML) and redundant
+    whitespace, keeping paragraph breaks.
+    """
+    text = html.unescape(_TAG_RE.sub(" ", text or ""))
+    lines = (_SPACES_RE.sub(" ", line).strip() for line in text.split("\n"))
+    return _BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
+
+
+def truncate_to_tokens(text, budget):
+    """
+    Cut ``text`` to about ``budget`` tokens, at a word boundary when possible.
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+    cut = text[: max(budget * 4 - 1, 0)]
+    boundary = cut.rfind(" ")
+    if boundary > len(cut) // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + "…"
+
+
+def format_qa(question, answer):
+    return f"Question: {compact_text(question)}\nAnswer: {compact_text(answer)}"
+
+
+def pack_context(entries, budget=CONTEXT_TOKEN_BUDGET, max_entries=CONTEXT_TOP_K):
+    """
+    Join the best-first context ``entries`` until the token budget is spent.
+
+    The first entry is always kept (truncated if it alone exceeds the
+    budget). Returns (context, number of entries used, estimated tokens).
+    """
+    parts, used = [], 0
+    for text in entries[:max_entries]:
+        cost = estimate_tokens(text) + (1 if parts else 0)
+        if used + cost > budget:
+            if not parts:
+                text = truncate_to_tokens(text, budget)
+                parts.append(text)
+                used = estimate_tokens(text)
+            break
+        parts.append(text)
+        used += cost
+    return "\n\n".join(parts), len(parts), used
@@ -0,0 +1,108 @@
+import math
+import re
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from shared.utils.retrieval_engine import top_k
+
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from how i if in is it its me my of on or should "
+    "so than that the their then there these this to was what when where which who why will "
+    "with you your".split()
+)
+# Title text counts this many times when building a document
+TITLE_WEIGHT = 2
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _stem(token):
+    # Light plural folding so "funds"/"fund" and "policies"/"policy" match
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    return [_stem(token) for token in _TOKEN_RE.findall((text or "").lower()) if token not in STOPWORDS]
+
+
+def record_text(record):
+    """
+    Searchable text of a knowledge base record: title, answer and tags.
+    """
+    tags = (record.get("tags") or "").replace(",", " ")
+    return " ".join([record.get("title", "")] * TITLE_WEIGHT + [record.get("answer_body", ""), tags])
+
+
+class BM25Index:
+    """
+    In-memory BM25 (Okapi) inverted index.
+
+    Postings are kept per term as parallel numpy arrays of document
+    positions and term frequencies, so a query only touches the documents
+    that contain its terms.
+    """
+
+    def __init__(self, documents, k1=1.5, b=0.75):
+        """
+        ``documents`` is an iterable of (doc_id, text).
+        """
+        self.k1 = k1
+        self.b = b
+        self.ids = []
+        lengths = []
+        postings = defaultdict(lambda: ([], []))
+        for doc_id, text in documents:
+            position = len(self.ids)
+            self.ids.append(doc_id)
+            counts = Counter(tokenize(text))
+            lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                docs, tfs = postings[term]
+                docs.append(position)
+                tfs.append(tf)
+        self.doc_lengths = np.asarray(lengths, dtype=np.float32)
+        avg_length = float(self.doc_lengths.mean()) if lengths else 0.0
+        # Per-document part of the BM25 denominator, precomputed once
+        self._norms = k1 * (1 - b + b * self.doc_lengths / avg_length) if avg_length else self.doc_lengths
+        n_docs = len(self.ids)
+        self.postings = {}
+        for term, (docs, tfs) in postings.items():
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            self.postings[term] = (np.asarray(docs, dtype=np.int64), np.asarray(tfs, dtype=np.float32), idf)
+
+    @classmethod
+    def from_records(cls, records, **kwargs):
+        return cls(((record["question_id"], record_text(record)) for record in records), **kwargs)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def search(self, query, k=5, min_coverage=0.0):
+        """
+        Return up to ``k`` (id, score) pairs, best first.
+
+        Documents matching fewer than ``min_coverage`` of the distinct query
+        terms are dropped.
+        """
+        query_terms = set(tokenize(query))
+        terms = [term for term in query_terms if term in self.postings]
+        if not terms or not self.ids:
+            return []
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        matched = np.zeros(len(self.ids), dtype=np.int32)
+        for term in terms:
+            docs, tfs, idf = self.postings[term]
+            scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + self._norms[docs])
+            matched[docs] += 1
+        scores[matched < min_coverage * len(query_terms)] = 0
+        candidates = np.flatnonzero(scores > 0)
+        if not len(candidates):
+            return []
+        best, _ = top_k(scores[candidates], k)
+        best = candidates[best]
+        return [(self.ids[i], float(scores[i])) for i in best]
@@ -0,0 +1,221 @@
+import bisect
+import contextvars
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+
+# Set METRICS_ENABLED=0 to turn every timer and counter into a no-op
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+# Add a Server-Timing header with per-stage durations to every response
+SERVER_TIMING = os.getenv("SERVER_TIMING", "0") == "1"
+# Seconds; spans cache hits (sub-ms) to slow BigQuery scans and generations
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Stage timings of the request being served: a list shared by every thread
+# the request's work runs on (see traced_call)
+_trace = contextvars.ContextVar("stage_trace", default=None)
+_DISABLED = nullcontext()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        if not self.registry.enabled:
+            return
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] += amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for key, value in values.items():
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (last one is +Inf), sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        if not self.registry.enabled:
+            return
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][position] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for key, (counts, total, count) in series.items():
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(float(bound))}, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters and histograms, rendered in the Prometheus text
+    format. Collectors registered with ``register_collector`` are called at
+    scrape time, so stats that components already keep (cache hit counts,
+    scheduler counters) are exported without touching their hot paths.
+    """
+
+    def __init__(self, enabled=METRICS_ENABLED):
+        self.enabled = enabled
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(self, name, *args, **kwargs)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def register_collector(self, collector):
+        """
+        ``collector()`` yields (name, kind, documentation, labels, value).
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        families = {}
+        for metric in metrics:
+            families[metric.name] = (metric.kind, metric.documentation, list(metric.samples()))
+        for collector in collectors:
+            try:
+                for name, kind, documentation, labels, value in collector():
+                    families.setdefault(name, (kind, documentation, []))[2].append((name, labels, value))
+            except Exception as exc:
+                print(f"⚠️ Metrics collector {collector!r} failed: {exc}")
+        lines = []
+        for name, (kind, documentation, samples) in families.items():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+STAGE_SECONDS = metrics.histogram("fyza_stage_seconds", "Time spent in each pipeline stage", ("stage",))
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "fyza_http_request_seconds", "HTTP request latency", ("method", "route", "status")
+)
+
+
+def observe_stage(stage, seconds):
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    trace = _trace.get()
+    if trace is not None:
+        trace.append((stage, seconds))
+
+
+class _StageTimer:
+    __slots__ = ("stage", "started")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        observe_stage(self.stage, time.perf_counter() - self.started)
+
+
+def stage_timer(stage):
+    """
+    Context manager recording the block's duration under ``stage``.
+    """
+    return _StageTimer(stage) if metrics.enabled else _DISABLED
+
+
+def start_trace():
+    """
+    Collect the stage timings of the current request (and of work it hands
+    to other threads through ``traced_call``); returns the list they land in.
+    """
+    trace = []
+    _trace.set(trace)
+    return trace
+
+
+def traced_call(func):
+    """
+    Wrap ``func`` to run in the caller's context, so stages timed on an
+    executor thread are attributed to the request that queued them.
+    """
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(func, *args, **kwargs)
+
+
+def server_timing(trace, total=None):
+    """
+    Server-Timing header value: total milliseconds per stage, in first-seen order.
+    """
+    durations = {}
+    for stage, seconds in list(trace):
+        durations[stage] = durations.get(stage, 0.0) + seconds
+    if total is not None:
+        durations["total"] = total
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in durations.items())
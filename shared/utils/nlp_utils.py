@@ -1,13 +1,61 @@
-import spacy
+import os
+import threading
+from functools import lru_cache
 
-# Load spaCy English model
-nlp = spacy.load("en_core_web_sm")
+from shared.utils.startup import startup_stage
 
+# "fast" drops the parser and NER, which keyword extraction never reads;
+# "full" loads the complete en_core_web_sm pipeline.
+KEYWORD_MODE = os.getenv("KEYWORD_MODE", "fast")
+KEYWORD_CACHE_SIZE = int(os.getenv("KEYWORD_CACHE_SIZE", "4096"))
 
-def extract_keywords(text: str):
+# Components only needed for dependency parses and entities. Lemmas come
+# from tok2vec -> tagger -> attribute_ruler -> lemmatizer, which stay.
+UNUSED_COMPONENTS = ["parser", "ner", "senter"]
+
+# spaCy English pipelines, loaded on first use (see get_nlp)
+_pipelines = {}
+_nlp_lock = threading.Lock()
+
+
+def get_nlp(mode=None):
+    """
+    Load the spaCy English model once per mode, on first use.
+    """
+    mode = mode or KEYWORD_MODE
+    if mode not in _pipelines:
+        with _nlp_lock:
+            if mode not in _pipelines:
+                with startup_stage(f"spacy_{mode}"):
+                    import spacy
+
+                    exclude = UNUSED_COMPONENTS if mode == "fast" else []
+                    _pipelines[mode] = spacy.load("en_core_web_sm", exclude=exclude)
+    return _pipelines[mode]
+
+
+def keywords_from_doc(doc):
+    return list({token.lemma_ for token in doc if token.is_alpha and not token.is_stop})
+
+
+@lru_cache(maxsize=KEYWORD_CACHE_SIZE)
+def _cached_keywords(text, mode):
+    return tuple(keywords_from_doc(get_nlp(mode)(text)))
+
+
+def extract_keywords(text: str, mode=None):
     """
     Extract meaningful keywords from user query using spaCy.
+
+    Results are memoized per lowercased query.
+    """
+    return list(_cached_keywords(text.lower(), mode or KEYWORD_MODE))  # unique keywords
+
+
+def extract_keywords_batch(texts, mode=None, batch_size=256, n_process=1):
+    """
+    Extract keywords for many texts at once through ``nlp.pipe``.
     """
-    doc = nlp(text.lower())
-    keywords = [token.lemma_ for token in doc if token.is_alpha and not token.is_stop]
-    return list(set(keywords))  # unique keywords
+    nlp = get_nlp(mode)
+    docs = nlp.pipe((text.lower() for text in texts), batch_size=batch_size, n_process=n_process)
+    return [keywords_from_doc(doc) for doc in docs]
@@ -0,0 +1,114 @@
+import os
+
+import numpy as np
+
+# Which engine VectorIndex/find_top_k build by default: "exact" or "ivf"
+RETRIEVAL_ENGINE = os.getenv("RETRIEVAL_ENGINE", "exact")
+# IVF knobs: more lists -> faster probes, more probes -> higher recall
+IVF_NLIST = int(os.getenv("IVF_NLIST", "0"))  # 0 = sqrt(n)
+IVF_NPROBE = int(os.getenv("IVF_NPROBE", "8"))
+ASSIGN_CHUNK = 65536
+
+
+def normalize(matrix):
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k(scores, k):
+    """
+    Indices and values of the ``k`` largest scores, best first.
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return top, scores[top]
+
+
+class BruteForceEngine:
+    """
+    Exact cosine search: one matrix-vector product over the whole corpus.
+    """
+
+    def __init__(self, embeddings, normalized=False):
+        self.embeddings = embeddings if normalized else normalize(embeddings)
+
+    def __len__(self):
+        return len(self.embeddings)
+
+    def search(self, query_embedding, k=1):
+        query = normalize(query_embedding)
+        return top_k(self.embeddings @ query, k)
+
+
+class IVFEngine:
+    """
+    Inverted-file ANN search.
+
+    Rows are clustered with spherical k-means; a query only scores the rows
+    in its ``n_probe`` closest clusters. Rows are stored grouped by cluster
+    so every probed list is one contiguous slice.
+    """
+
+    def __init__(self, embeddings, n_list=IVF_NLIST, n_probe=IVF_NPROBE, n_iter=10, seed=0, normalized=False):
+        embeddings = embeddings if normalized else normalize(embeddings)
+        n = len(embeddings)
+        self.n_list = max(1, min(n_list or int(np.sqrt(n)), n))
+        self.n_probe = n_probe
+        self.centroids = self._train(embeddings, n_iter, np.random.default_rng(seed))
+
+        assignments = self._assign(embeddings)
+        self.order = np.argsort(assignments, kind="stable")
+        self.embeddings = np.ascontiguousarray(embeddings[self.order])
+        counts = np.bincount(assignments, minlength=self.n_list)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def __len__(self):
+        return len(self.order)
+
+    def _train(self, embeddings, n_iter, rng):
+        # Train on a bounded sample so building stays cheap for large corpora
+        sample_size = min(len(embeddings), 256 * self.n_list)
+        sample = embeddings[rng.choice(len(embeddings), sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, self.n_list, replace=False)].copy()
+        for _ in range(n_iter):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = np.bincount(labels, minlength=self.n_list) == 0
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+            centroids = normalize(sums)
+        return centroids
+
+    def _assign(self, embeddings):
+        labels = np.empty(len(embeddings), dtype=np.int64)
+        for start in range(0, len(embeddings), ASSIGN_CHUNK):
+            chunk = embeddings[start : start + ASSIGN_CHUNK]
+            labels[start : start + len(chunk)] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return labels
+
+    def search(self, query_embedding, k=1, n_probe=None):
+        query = normalize(query_embedding)
+        n_probe = min(n_probe or self.n_probe, self.n_list)
+        lists, _ = top_k(self.centroids @ query, n_probe)
+        candidates = np.concatenate(
+            [np.arange(self.offsets[i], self.offsets[i + 1]) for i in lists]
+        )
+        positions, scores = top_k(self.embeddings[candidates] @ query, k)
+        return self.order[candidates[positions]], scores
+
+
+ENGINES = {
+    "exact": BruteForceEngine,
+    "ivf": IVFEngine,
+}
+
+
+def create_engine(embeddings, kind=RETRIEVAL_ENGINE, **kwargs):
+    if kind not in ENGINES:
+        raise ValueError(f"Unknown retrieval engine '{kind}', expected one of {sorted(ENGINES)}")
+    return ENGINES[kind](embeddings, **kwargs)
@@ -0,0 +1,98 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+from shared.utils.retrieval_engine import normalize
+
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.92"))
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "2048"))
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", "3600"))  # seconds, 0 = never expire
+
+
+class SemanticCache:
+    """
+    Answer cache keyed on query-embedding similarity.
+
+    Cached query embeddings live in one preallocated float32 matrix so a
+    lookup is a single matrix-vector product. A lookup hits when the best
+    cosine similarity is at least ``threshold`` and the entry is younger
+    than ``ttl_seconds``. When full, the least recently used slot is reused.
+    """
+
+    def __init__(self, threshold=ANSWER_CACHE_THRESHOLD, max_entries=ANSWER_CACHE_SIZE,
+                 ttl_seconds=ANSWER_CACHE_TTL):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._answers = [None] * max_entries
+        self._queries = [None] * max_entries
+        self._created_at = np.zeros(max_entries)
+        self._last_used = np.zeros(max_entries)
+        self._valid = np.zeros(max_entries, dtype=bool)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return int(self._valid.sum())
+
+    def _expire(self, now):
+        if self.ttl_seconds > 0:
+            self._valid &= now - self._created_at <= self.ttl_seconds
+
+    def lookup(self, query_embedding):
+        """
+        Return (answer, similarity) for the closest cached query, or None.
+        """
+        query = normalize(query_embedding)
+        now = time.time()
+        with self._lock:
+            if self._matrix is None or not self._valid.any():
+                self.misses += 1
+                return None
+            self._expire(now)
+            scores = np.where(self._valid, self._matrix @ query, -np.inf)
+            slot = int(np.argmax(scores))
+            if scores[slot] < self.threshold:
+                self.misses += 1
+                return None
+            self._last_used[slot] = now
+            self.hits += 1
+            return self._answers[slot], float(scores[slot])
+
+    def store(self, query_embedding, query_text, answer):
+        query = normalize(query_embedding)
+        now = time.time()
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros((self.max_entries, len(query)), dtype=np.float32)
+            self._expire(now)
+            if self._valid.all():
+                slot = int(np.argmin(self._last_used))
+                self.evictions += 1
+            else:
+                slot = int(np.argmin(self._valid))
+            self._matrix[slot] = query
+            self._answers[slot] = answer
+            self._queries[slot] = query_text
+            self._created_at[slot] = now
+            self._last_used[slot] = now
+            self._valid[slot] = True
+
+    def clear(self):
+        with self._lock:
+            self._valid[:] = False
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
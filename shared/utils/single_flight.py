@@ -0,0 +1,74 @@
+import asyncio
+import re
+
+from shared.utils.metrics import metrics
+
+SINGLE_FLIGHT_CALLS = metrics.counter(
+    "fyza_single_flight_calls_total",
+    "Calls through a single-flight group; role=follower calls reused another call's result",
+    ("flight", "role"),
+)
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_question(text):
+    """
+    Key for questions that only differ in case, spacing or end punctuation.
+    """
+    return _SPACE_RE.sub(" ", text).strip().rstrip("?!. ").lower()
+
+
+def normalize_symbols(symbols):
+    return tuple(sorted({symbol.strip().upper() for symbol in symbols}))
+
+
+class SingleFlight:
+    """
+    Collapse concurrent identical calls into one.
+
+    The first caller for a key (the leader) starts the computation as its
+    own task; callers arriving with the same key while it runs (followers)
+    await that task instead of starting another. Every caller gets the same
+    result or exception. Callers are shielded from each other: one client
+    going away does not cancel the computation the others are waiting on.
+    Nothing is cached once the call finishes.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._inflight = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def _finished(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved even if every caller went away
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key, func):
+        """
+        Return ``await func()``, sharing one in-flight call per ``key``.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self.leaders += 1
+            SINGLE_FLIGHT_CALLS.inc(flight=self.name, role="leader")
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.followers += 1
+            SINGLE_FLIGHT_CALLS.inc(flight=self.name, role="follower")
+        return await asyncio.shield(task)
+
+    def stats(self):
+        calls = self.leaders + self.followers
+        return {
+            "in_flight": len(self._inflight),
+            "leaders": self.leaders,
+            "followers": self.followers,
+            "collapse_rate": self.followers / calls if calls else 0.0,
+        }
@@ -0,0 +1,41 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Taken when this module is first imported, i.e. as early as the app imports it
+IMPORT_STARTED_AT = time.perf_counter()
+
+_stages = {}
+_lock = threading.Lock()
+_warm = threading.Event()
+
+
+@contextmanager
+def startup_stage(name):
+    """
+    Time a one-off initialization step for the startup report.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _lock:
+            _stages[name] = round((time.perf_counter() - started) * 1000, 2)
+
+
+def mark_warm():
+    _warm.set()
+
+
+def is_warm():
+    return _warm.is_set()
+
+
+def startup_report():
+    with _lock:
+        stages = dict(_stages)
+    return {
+        "warm": is_warm(),
+        "uptime_ms": round((time.perf_counter() - IMPORT_STARTED_AT) * 1000, 2),
+        "stages_ms": stages,
+    }
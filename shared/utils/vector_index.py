@@ -0,0 +1,118 @@
+import json
+import os
+
+import numpy as np
+
+from shared.utils.retrieval_engine import RETRIEVAL_ENGINE, create_engine, normalize
+
+KNOWLEDGE_BASE_PATH = "data/knowledge_base/finance_qa.jsonl"
+INDEX_DIR = "data/knowledge_base/index"
+EMBEDDINGS_FILE = "embeddings.f32"
+IDS_FILE = "ids.json"
+# Incremental ingestion state (services/ingestion/pipeline.py)
+INGEST_STATE_FILE = "ingest_state.sqlite"
+BUILD_BATCH_SIZE = 100
+
+
+def load_knowledge_base(path=KNOWLEDGE_BASE_PATH):
+    """
+    Load the knowledge base JSONL into a dict keyed by question_id.
+    """
+    records = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                records[record["question_id"]] = record
+    return records
+
+
+class VectorIndex:
+    """
+    Read-only vector index over pre-normalized float32 embeddings.
+
+    On disk the index is a raw row-major float32 matrix (``embeddings.f32``)
+    plus a JSON sidecar (``ids.json``) holding the dimension and the row ids,
+    so loading is a memory map rather than a parse. Search is delegated to
+    a retrieval engine (see ``shared.utils.retrieval_engine``).
+    """
+
+    def __init__(self, embeddings, ids, engine=RETRIEVAL_ENGINE):
+        if len(embeddings) != len(ids):
+            raise ValueError("embeddings and ids must have the same length")
+        self.embeddings = embeddings
+        self.ids = list(ids)
+        self.engine = create_engine(embeddings, engine, normalized=True) if self.ids else None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, index_dir=INDEX_DIR, engine=RETRIEVAL_ENGINE):
+        with open(os.path.join(index_dir, IDS_FILE), encoding="utf-8") as f:
+            sidecar = json.load(f)
+        ids = sidecar["ids"]
+        embeddings = np.memmap(
+            os.path.join(index_dir, EMBEDDINGS_FILE),
+            dtype=np.float32,
+            mode="r",
+            shape=(len(ids), sidecar["dim"]),
+        )
+        return cls(embeddings, ids, engine)
+
+    @classmethod
+    def load_if_exists(cls, index_dir=INDEX_DIR, engine=RETRIEVAL_ENGINE):
+        if not os.path.exists(os.path.join(index_dir, IDS_FILE)):
+            return None
+        return cls.load(index_dir, engine)
+
+    def search(self, query_embedding, k=5):
+        """
+        Return the ``k`` most similar (id, score) pairs, best first.
+        """
+        if self.engine is None:
+            return []
+        indices, scores = self.engine.search(query_embedding, k)
+        return [(self.ids[i], float(score)) for i, score in zip(indices, scores)]
+
+
+def write_index(embeddings, ids, index_dir=INDEX_DIR):
+    """
+    Persist normalized embeddings and their ids to ``index_dir``.
+    """
+    embeddings = normalize(embeddings)
+    os.makedirs(index_dir, exist_ok=True)
+    embeddings.tofile(os.path.join(index_dir, EMBEDDINGS_FILE))
+    with open(os.path.join(index_dir, IDS_FILE), "w", encoding="utf-8") as f:
+        json.dump({"dim": int(embeddings.shape[1]), "ids": list(ids)}, f)
+
+
+def build_index(model, kb_path=KNOWLEDGE_BASE_PATH, index_dir=INDEX_DIR, batch_size=BUILD_BATCH_SIZE):
+    """
+    Embed every knowledge base title once and write the index to disk.
+    """
+    records = list(load_knowledge_base(kb_path).values())
+    titles = [record["title"] for record in records]
+    vectors = []
+    for i in range(0, len(titles), batch_size):
+        batch = titles[i : i + batch_size]
+        vectors.extend(embedding.values for embedding in model.get_embeddings(batch))
+    write_index(np.asarray(vectors, dtype=np.float32), [r["question_id"] for r in records], index_dir)
+    # A full rebuild invalidates the ingestion state; it is re-seeded on next use
+    state_path = os.path.join(index_dir, INGEST_STATE_FILE)
+    if os.path.exists(state_path):
+        os.remove(state_path)
+    print(f"Indexed {len(records)} rows into {index_dir}")
+
+
+if __name__ == "__main__":
+    from vertexai.language_models import TextEmbeddingModel
+
+    from shared.utils.config import init_vertex_ai
+    from shared.utils.embedding_scheduler import EMBED_CONCURRENCY, EMBED_MAX_BATCH, EmbeddingScheduler
+
+    init_vertex_ai()
+    # Hand the scheduler enough titles per call to keep every worker busy
+    build_index(EmbeddingScheduler(TextEmbeddingModel.from_pretrained("text-embedding-005")),
+                batch_size=EMBED_MAX_BATCH * EMBED_CONCURRENCY)
@@ -0,0 +1,38 @@
+"""
+Shared fixtures. Remote services are replaced by the stand-ins in
+benchmarks/fakes.py, with their latencies set to zero.
+"""
+import json
+import os
+
+import pytest
+
+# backend.dependencies builds its engine at import; keep tests on an
+# in-memory database unless one is given explicitly
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+KNOWLEDGE_BASE_ROWS = [
+    ("question_0001", "What is a mutual fund?", "A mutual fund pools money from many investors.",
+     "mutual fund,investment,portfolio"),
+    ("question_0002", "How do index funds work?", "An index fund tracks a market index.",
+     "index fund,investment,passive"),
+    ("question_0003", "What is a stock dividend?", "A dividend is a share of company profits.",
+     "stock,dividend,income"),
+    ("question_0004", "How is capital gains tax charged?", "Gains on assets sold at a profit are taxed.",
+     "tax,capital gains,stock"),
+    ("question_0005", "What is an emergency fund?", "Savings set aside for unexpected expenses.",
+     "savings,budget,emergency fund"),
+]
+
+
+@pytest.fixture
+def knowledge_base(tmp_path):
+    """
+    Path of a small finance_qa.jsonl in the real knowledge base's format.
+    """
+    path = tmp_path / "finance_qa.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        for question_id, title, answer, tags in KNOWLEDGE_BASE_ROWS:
+            f.write(json.dumps({"question_id": question_id, "title": title, "answer_body": answer,
+                                "tags": tags}) + "\n")
+    return str(path)
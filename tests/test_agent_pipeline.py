@@ -0,0 +1,61 @@
+import asyncio
+import threading
+
+import numpy as np
+
+from benchmarks.fakes import FakeEmbeddingModel
+from services.insights.finance_agent.agent_pipeline import NO_KEYWORDS_ANSWER, QAPipeline
+from shared.utils.vector_index import write_index
+
+
+def make_pipeline(knowledge_base, tmp_path):
+    pipeline = QAPipeline(index_dir=str(tmp_path / "no_index"), kb_path=knowledge_base)
+    pipeline.embedding_model = FakeEmbeddingModel(latency_ms=0, per_text_ms=0)
+    return pipeline
+
+
+def test_aretrieve_loads_local_indexes_off_the_event_loop(knowledge_base, tmp_path, monkeypatch):
+    pipeline = make_pipeline(knowledge_base, tmp_path)
+    load_threads = []
+    load_index = pipeline._load_index
+
+    def recording_load():
+        load_threads.append(threading.current_thread())
+        load_index()
+
+    monkeypatch.setattr(pipeline, "_load_index", recording_load)
+
+    _, cached, retrieved = asyncio.run(pipeline.aretrieve("What is a mutual fund?"))
+
+    assert cached is None
+    assert load_threads and threading.main_thread() not in load_threads
+    context, metadata = retrieved
+    assert metadata["source"] == "lexical"
+    assert metadata["question_id"] == "question_0001"
+    assert "pools money" in context
+
+
+def test_context_from_rankings_skips_ids_missing_from_the_knowledge_base(knowledge_base, tmp_path):
+    pipeline = make_pipeline(knowledge_base, tmp_path)
+
+    context, metadata = pipeline.context_from_rankings(
+        [[("question_9999", 0.99), ("question_0002", 0.9)], [("question_0003", 4.2)]], "index"
+    )
+
+    assert [match["question_id"] for match in metadata["matches"]] == ["question_0003", "question_0002"]
+    assert metadata["question_id"] == "question_0003"
+    assert "index fund" in context
+
+
+def test_stale_index_without_known_ids_takes_the_no_context_path(knowledge_base, tmp_path):
+    model = FakeEmbeddingModel(latency_ms=0, per_text_ms=0, dim=16)
+    index_dir = tmp_path / "stale_index"
+    write_index(np.array([model.vector("bond ladder"), model.vector("annuity")], dtype=np.float32),
+                ["question_9998", "question_9999"], str(index_dir))
+    pipeline = QAPipeline(index_dir=str(index_dir), kb_path=str(tmp_path / "missing.jsonl"))
+    pipeline.embedding_model = model
+
+    assert pipeline.context_from_rankings([[("question_9999", 0.9)]], "index") is None
+    _, cached, retrieved = asyncio.run(pipeline.aretrieve("What is a bond ladder?"))
+    assert cached is None and retrieved is None
+    assert asyncio.run(pipeline.agenerate_answer("What is a bond ladder?")) == NO_KEYWORDS_ANSWER
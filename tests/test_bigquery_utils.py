@@ -0,0 +1,53 @@
+import pandas as pd
+
+from benchmarks.fakes import FakeBigQueryClient, FakeQueryJob
+from shared.utils.bigquery_utils import FINANCIAL_DATA_QUERY, fetch_financial_data, frame_from_pages
+
+
+def test_fetch_financial_data_runs_one_parameterized_query(knowledge_base):
+    client = FakeBigQueryClient(knowledge_base, latency_ms=0)
+
+    df = fetch_financial_data(["investment", "stock", "investment"], client=client)
+
+    # One job for every keyword, no dry run on the hot path
+    assert client.jobs == 1
+    assert client.queries == [FINANCIAL_DATA_QUERY]
+    assert list(df.columns) == ["input_text", "output_text", "category"]
+    # Rows stay grouped in keyword order; the duplicate keyword is dropped
+    assert df["category"].tolist() == ["investment", "investment", "stock", "stock"]
+    assert df["input_text"].tolist()[:2] == ["What is a mutual fund?", "How do index funds work?"]
+
+
+def test_fetch_financial_data_caps_rows(knowledge_base):
+    client = FakeBigQueryClient(knowledge_base, latency_ms=0)
+
+    df = fetch_financial_data(["investment", "stock", "tax"], max_rows=3, client=client)
+
+    assert len(df) == 3
+
+
+def test_fetch_financial_data_without_keywords_skips_bigquery(knowledge_base):
+    client = FakeBigQueryClient(knowledge_base, latency_ms=0)
+
+    df = fetch_financial_data([], client=client)
+
+    assert client.jobs == 0
+    assert df.empty
+    assert list(df.columns) == ["input_text", "output_text", "category"]
+
+
+def test_frame_from_pages_joins_pages_in_order():
+    source = pd.DataFrame({"input_text": [f"q{i}" for i in range(7)], "output_text": [f"a{i}" for i in range(7)]})
+
+    df = frame_from_pages(FakeQueryJob(source, "job", 0, page_size=3))
+
+    pd.testing.assert_frame_equal(df, source)
+
+
+def test_frame_from_pages_keeps_columns_of_empty_results():
+    source = pd.DataFrame(columns=["input_text", "output_text"])
+
+    df = frame_from_pages(FakeQueryJob(source, "job", 0))
+
+    assert df.empty
+    assert list(df.columns) == ["input_text", "output_text"]
@@ -0,0 +1,138 @@
+import threading
+
+import pytest
+
+from benchmarks.fakes import FakeEmbeddingModel
+from shared.utils.embedding_scheduler import EmbeddingError, EmbeddingScheduler, RateLimiter
+from shared.utils.embedding_utils import encode_texts
+
+
+class Unavailable(Exception):
+    # Shaped like google.api_core's ServiceUnavailable
+    code = 503
+
+
+class FlakyEmbeddingModel(FakeEmbeddingModel):
+    """
+    Fails the first ``transient_failures`` calls with a 503, and every call
+    whose batch holds a text containing "BAD".
+    """
+
+    def __init__(self, transient_failures=0):
+        super().__init__(latency_ms=0, per_text_ms=0, dim=8)
+        self.transient_failures = transient_failures
+        self.batches = []
+
+    def get_embeddings(self, texts):
+        with self._lock:
+            self.batches.append(list(texts))
+            if self.transient_failures:
+                self.transient_failures -= 1
+                raise Unavailable("try again")
+        if any("BAD" in text for text in texts):
+            raise ValueError("invalid input text")
+        return super().get_embeddings(texts)
+
+
+def make_scheduler(model, **kwargs):
+    kwargs.setdefault("window_ms", 20)
+    return EmbeddingScheduler(model, sleep=lambda seconds: None, **kwargs)
+
+
+def test_concurrent_texts_are_coalesced_into_batches():
+    model = FlakyEmbeddingModel()
+    scheduler = make_scheduler(model, max_batch_size=100, window_ms=50, concurrency=1)
+    results = {}
+
+    def embed(i):
+        results[i] = scheduler.embed([f"query {i}"])[0]
+
+    threads = [threading.Thread(target=embed, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == list(range(20))
+    assert results[3] == model.vector("query 3")
+    assert len(model.batches) < 20
+    assert scheduler.stats()["texts"] == 20
+
+
+def test_batches_never_exceed_the_maximum_size():
+    model = FlakyEmbeddingModel()
+    scheduler = make_scheduler(model, max_batch_size=4)
+
+    vectors = scheduler.embed([f"row {i}" for i in range(10)])
+
+    assert len(vectors) == 10
+    assert max(len(batch) for batch in model.batches) <= 4
+
+
+def test_transient_errors_are_retried():
+    model = FlakyEmbeddingModel(transient_failures=2)
+    scheduler = make_scheduler(model, max_retries=3)
+
+    vectors = scheduler.embed(["what is a mutual fund"])
+
+    assert vectors == [model.vector("what is a mutual fund")]
+    assert scheduler.stats()["retries"] == 2
+    assert scheduler.stats()["failed_texts"] == 0
+
+
+def test_exhausted_retries_fail_the_batch():
+    model = FlakyEmbeddingModel(transient_failures=10)
+    scheduler = make_scheduler(model, max_retries=2)
+
+    with pytest.raises(EmbeddingError) as excinfo:
+        scheduler.embed(["a", "b"])
+
+    assert set(excinfo.value.errors) == {0, 1}
+    assert all(isinstance(error, Unavailable) for error in excinfo.value.errors.values())
+    # One batch: the first call plus two retries, and no splitting
+    assert len(model.batches) == 3
+    assert scheduler.stats()["splits"] == 0
+
+
+def test_bad_inputs_are_isolated_by_splitting():
+    model = FlakyEmbeddingModel()
+    scheduler = make_scheduler(model, max_batch_size=8, concurrency=1)
+    texts = ["stocks", "bonds", "BAD input", "gold", "cash", "funds"]
+
+    with pytest.raises(EmbeddingError) as excinfo:
+        scheduler.embed(texts)
+
+    error = excinfo.value
+    assert list(error.errors) == [2]
+    assert isinstance(error.errors[2], ValueError)
+    assert error.results[2] is None
+    assert [error.results[i] for i in (0, 1, 3, 4, 5)] == [model.vector(texts[i]) for i in (0, 1, 3, 4, 5)]
+    assert scheduler.stats()["splits"] > 0
+    assert scheduler.stats()["failed_texts"] == 1
+
+
+def test_encode_texts_keeps_partial_results_of_a_failed_batch():
+    model = FlakyEmbeddingModel()
+    scheduler = make_scheduler(model, concurrency=1)
+
+    with pytest.raises(EmbeddingError) as excinfo:
+        encode_texts(scheduler, ["stocks", "BAD", "bonds"], cache=None)
+
+    assert list(excinfo.value.errors) == [1]
+    assert excinfo.value.results[0] == model.vector("stocks")
+    assert excinfo.value.results[1] is None
+
+
+def test_rate_limiter_spaces_calls():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(rate=10, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        limiter.acquire()
+
+    assert sleeps == pytest.approx([0.1, 0.1])
@@ -0,0 +1,146 @@
+import threading
+import time
+
+import pytest
+
+from benchmarks.fakes import FakeGenerativeModel, FakeMarketDataProvider
+from services.insights.stock_analysis.analytics import compute_stock_features, format_feature_table
+from shared.utils.generation_client import GenerationClient, GenerationOverloaded
+from shared.utils.generation_utils import build_prompt
+from shared.utils.hybrid_retrieval import estimate_tokens
+
+
+class CountingModel(FakeGenerativeModel):
+    """
+    Fake model that tracks how many generations run at once.
+    """
+
+    latency_ms = 100
+    chunk_ms = 0
+    chunks = 3
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        cls = type(self)
+        with cls.lock:
+            cls.running += 1
+            cls.peak = max(cls.peak, cls.running)
+        try:
+            response = super().generate_content(prompt, generation_config, stream=False)
+        finally:
+            with cls.lock:
+                cls.running -= 1
+        return iter([response]) if stream else response
+
+
+@pytest.fixture
+def counting_model():
+    model = type("CountingModelForTest", (CountingModel,), {"running": 0, "peak": 0, "lock": threading.Lock()})
+    return model
+
+
+def run_threads(count, target):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(target())
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_model_handles_are_reused():
+    built = []
+
+    def factory(name):
+        built.append(name)
+        return FakeGenerativeModel(name)
+
+    client = GenerationClient(model_factory=factory)
+    assert client.model() is client.model()
+    assert client.model("other-model") is not client.model()
+    assert built == [client.model_name, "other-model"]
+
+
+def test_concurrent_generations_are_capped(counting_model):
+    client = GenerationClient(max_concurrency=2, max_queue=10, queue_timeout=5, model_factory=counting_model)
+
+    results, errors = run_threads(6, lambda: client.generate("prompt"))
+
+    assert len(results) == 6 and not errors
+    assert counting_model.peak == 2
+    assert client.stats()["completed"] == 6
+    assert client.stats()["active"] == client.stats()["queued"] == 0
+
+
+def test_calls_beyond_the_queue_are_shed(counting_model):
+    client = GenerationClient(max_concurrency=1, max_queue=1, queue_timeout=5, model_factory=counting_model)
+
+    results, errors = run_threads(5, lambda: client.generate("prompt"))
+
+    # One running, one queued, the rest rejected immediately
+    assert len(results) == 2
+    assert len(errors) == 3
+    assert all(isinstance(error, GenerationOverloaded) for error in errors)
+    assert client.stats()["shed"] == 3
+
+
+def test_queued_calls_time_out(counting_model):
+    client = GenerationClient(max_concurrency=1, max_queue=5, queue_timeout=0.02, model_factory=counting_model)
+
+    started = time.perf_counter()
+    results, errors = run_threads(3, lambda: client.generate("prompt"))
+
+    assert len(results) == 1
+    assert len(errors) == 2 and all("queue_timeout" in str(error) for error in errors)
+    assert time.perf_counter() - started < 1
+
+
+def test_streams_hold_their_slot_until_exhausted():
+    model = type("InstantModel", (FakeGenerativeModel,), {"latency_ms": 0, "chunk_ms": 0})
+    client = GenerationClient(max_concurrency=1, max_queue=0, model_factory=model)
+
+    stream = client.stream("prompt")
+    first = next(stream)
+    with pytest.raises(GenerationOverloaded):
+        client.generate("another prompt")
+    rest = list(stream)
+
+    assert first.startswith("Point 1")
+    assert len(rest) == model.chunks - 1
+    assert client.generate("another prompt")
+
+
+def test_fit_context_compacts_and_truncates():
+    client = GenerationClient(context_tokens=10, model_factory=FakeGenerativeModel)
+
+    fitted = client.fit_context("<p>Index   funds</p>\n\n\n\n<b>track</b> " + "the market " * 40)
+
+    assert fitted.startswith("Index funds\n\ntrack the market")
+    assert estimate_tokens(fitted) <= 11
+
+
+def test_fit_context_can_keep_tables_aligned():
+    provider = FakeMarketDataProvider(latency_ms=0)
+    features = compute_stock_features({symbol: provider.history(symbol) for symbol in ("AAPL", "MSFT", "TCS.NS")})
+    table = format_feature_table(features)
+    client = GenerationClient(model_factory=FakeGenerativeModel)
+
+    assert client.fit_context(table, compact=False) == table
+    # Compaction would collapse the padding that lines the columns up
+    assert client.fit_context(table) != table
+
+
+def test_build_prompt_keeps_packed_context_intact():
+    context = "Question: What is a mutual fund?\nAnswer: " + "A pooled investment. " * 200
+
+    assert context in build_prompt(context, "What is a mutual fund?")
@@ -0,0 +1,60 @@
+import json
+
+import numpy as np
+
+from benchmarks.fakes import FakeEmbeddingModel
+from services.ingestion.pipeline import KnowledgeBaseIngestor
+from shared.utils.vector_index import VectorIndex, build_index, load_knowledge_base
+
+
+def write_rows(path, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        for question_id, title in rows:
+            f.write(json.dumps({"question_id": question_id, "title": title, "answer_body": f"About {title}"}) + "\n")
+    return str(path)
+
+
+def make_ingestor(knowledge_base, index_dir):
+    return KnowledgeBaseIngestor(FakeEmbeddingModel(latency_ms=0, per_text_ms=0, dim=16), index_dir=str(index_dir),
+                                 kb_path=knowledge_base, cache=None)
+
+
+def test_first_ingest_without_index_covers_the_knowledge_base(knowledge_base, tmp_path):
+    source = write_rows(tmp_path / "new.jsonl", [("question_0100", "What is a bond ladder?")])
+    ingestor = make_ingestor(knowledge_base, tmp_path / "index")
+    try:
+        stats = ingestor.ingest(source)
+    finally:
+        ingestor.close()
+
+    assert stats["knowledge_base"]["new"] == 5
+    assert stats["new"] == 1
+    index = VectorIndex.load(str(tmp_path / "index"))
+    assert sorted(index.ids) == sorted(load_knowledge_base(knowledge_base))
+    assert index.search(FakeEmbeddingModel(dim=16).vector("What is a bond ladder?"), k=1)[0][0] == "question_0100"
+
+
+def test_changed_rows_do_not_touch_the_index_readers_have_open(knowledge_base, tmp_path):
+    index_dir = tmp_path / "index"
+    build_index(FakeEmbeddingModel(latency_ms=0, per_text_ms=0, dim=16), kb_path=knowledge_base,
+                index_dir=str(index_dir))
+    reader = VectorIndex.load(str(index_dir))
+    before = np.array(reader.embeddings)
+    changed = write_rows(tmp_path / "changed.jsonl", [("question_0001", "What are exchange traded funds?"),
+                                                      ("question_0200", "How do annuities work?")])
+
+    ingestor = make_ingestor(knowledge_base, index_dir)
+    try:
+        stats = ingestor.ingest(changed)
+    finally:
+        ingestor.close()
+
+    assert (stats["new"], stats["changed"]) == (1, 1)
+    # The open memory map still sees the vectors it was loaded with
+    np.testing.assert_array_equal(np.array(reader.embeddings), before)
+    assert not (index_dir / "embeddings.f32.next").exists()
+    reloaded = VectorIndex.load(str(index_dir))
+    assert len(reloaded) == 6
+    row = reloaded.ids.index("question_0001")
+    assert not np.allclose(reloaded.embeddings[row], before[row])
+    np.testing.assert_array_equal(reloaded.embeddings[1:5], before[1:5])
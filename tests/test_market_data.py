@@ -0,0 +1,93 @@
+import threading
+import time
+
+from benchmarks.fakes import FakeMarketDataProvider
+from services.insights.stock_analysis.market_data import MarketDataService
+from services.insights.stock_analysis.stock_service import stock_metrics
+
+SYMBOLS = ["AAPL", "MSFT", "GOOGL", "TCS.NS"]
+
+
+class HangingProvider(FakeMarketDataProvider):
+    """
+    Never answers for ``hung`` symbols until ``release`` is set.
+    """
+
+    def __init__(self, hung):
+        super().__init__(latency_ms=0)
+        self.hung = set(hung)
+        self.release = threading.Event()
+
+    def history(self, symbol, period="1mo"):
+        if symbol in self.hung:
+            self.release.wait(5)
+        return super().history(symbol, period)
+
+
+def test_get_histories_fetches_symbols_concurrently():
+    provider = FakeMarketDataProvider(latency_ms=200)
+    service = MarketDataService(provider, max_workers=len(SYMBOLS))
+
+    started = time.perf_counter()
+    histories = service.get_histories(SYMBOLS)
+    elapsed = time.perf_counter() - started
+
+    assert list(histories) == SYMBOLS
+    assert all(not history.empty for history in histories.values())
+    assert provider.calls == len(SYMBOLS)
+    # One download's latency, not four in a row
+    assert elapsed < 0.6
+
+
+def test_get_histories_serves_repeats_from_cache():
+    provider = FakeMarketDataProvider(latency_ms=0)
+    service = MarketDataService(provider)
+
+    first = service.get_histories(["AAPL", "MSFT"])
+    second = service.get_histories(["MSFT", "AAPL", "AAPL"])
+
+    assert provider.calls == 2
+    assert second["AAPL"] is first["AAPL"]
+    assert service.stats()["hits"] == 2
+
+
+def test_concurrent_requests_share_downloads():
+    provider = FakeMarketDataProvider(latency_ms=100)
+    service = MarketDataService(provider)
+    threads = [threading.Thread(target=service.get_histories, args=(["AAPL", "MSFT"],)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert provider.calls == 2
+
+
+def test_get_histories_reports_symbols_that_time_out():
+    provider = HangingProvider(hung={"MSFT"})
+    service = MarketDataService(provider, timeout=0.2)
+    try:
+        started = time.perf_counter()
+        histories = service.get_histories(["AAPL", "MSFT"])
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 1
+        assert not histories["AAPL"].empty
+        assert isinstance(histories["MSFT"], TimeoutError)
+        assert "MSFT" in str(histories["MSFT"])
+        assert service.stats()["timeouts"] == 1
+    finally:
+        provider.release.set()
+
+
+def test_stock_metrics_lists_timed_out_symbols_as_errors():
+    provider = HangingProvider(hung={"MSFT"})
+    service = MarketDataService(provider, timeout=0.2)
+    try:
+        features, errors = stock_metrics(["AAPL", "MSFT"], service=service)
+    finally:
+        provider.release.set()
+
+    assert list(features.index) == ["AAPL"]
+    assert list(errors) == ["MSFT"]
+    assert "Timed out" in errors["MSFT"]
@@ -0,0 +1,61 @@
+import tracemalloc
+from datetime import date
+
+import pytest
+
+from backend.profile.financialgoals.projections import (
+    MAX_PROJECTION_MONTHS,
+    PROJECTION_MAX_PATHS,
+    project_goals,
+    simulate_chunks,
+)
+
+TODAY = date(2026, 1, 15)
+
+
+def goal(goal_id, amount, target_date):
+    return {"goal_id": goal_id, "goal_name": f"Goal {goal_id}", "priority": "High", "target_amount": amount,
+            "target_date": target_date}
+
+
+def test_zero_volatility_plan_meets_its_target():
+    projection = project_goals([goal("1", 100_000, date(2036, 1, 15))], today=TODAY, inflation=0.0,
+                               expected_return=0.08, volatility=0.0, paths=200)
+
+    result = projection["goals"][0]
+    assert result["months_remaining"] == 120
+    assert result["success_probability"] == 1.0
+    assert result["contribution_for_confidence"] == pytest.approx(result["required_monthly_contribution"], rel=1e-6)
+
+
+def test_chunks_stay_within_the_cell_budget():
+    chunks = list(simulate_chunks(MAX_PROJECTION_MONTHS, 0.1, 0.12, 5001, seed=1, chunk_cells=100_000))
+
+    assert sum(rows.stop - rows.start for rows, _, _ in chunks) == 5001
+    assert all(growth.size <= 100_000 and growth.shape == sums.shape for _, growth, sums in chunks)
+
+
+def test_chunking_does_not_change_the_estimates():
+    goals = [goal(str(i), 50_000 * (i + 1), date(2030 + 5 * i, 6, 1)) for i in range(4)]
+
+    whole = project_goals(goals, today=TODAY, paths=4000)
+    chunked = project_goals(goals, today=TODAY, paths=4000, chunk_cells=10_000)
+
+    for a, b in zip(whole["goals"], chunked["goals"]):
+        assert a["required_monthly_contribution"] == b["required_monthly_contribution"]
+        assert a["success_probability"] == pytest.approx(b["success_probability"], abs=0.05)
+        assert a["contribution_for_confidence"] == pytest.approx(b["contribution_for_confidence"], rel=0.05)
+
+
+def test_longest_projection_memory_is_bounded():
+    goals = [goal("1", 1_000_000, date(2075, 12, 1)), goal("2", 200_000, date(2031, 1, 1))]
+
+    tracemalloc.start()
+    try:
+        project_goals(goals, today=TODAY, paths=PROJECTION_MAX_PATHS)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # One (paths x 600 months) float64 array alone would be 48 MB
+    assert peak < 48 * 1024 * 1024
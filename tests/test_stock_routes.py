@@ -0,0 +1,49 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from benchmarks.fakes import FakeGenerativeModel, FakeMarketDataProvider
+from services.insights.stock_analysis import routes
+from services.insights.stock_analysis.market_data import MarketDataService
+from shared.utils.generation_client import generation_client, vertex_model
+
+
+class SlowFakeGenerativeModel(FakeGenerativeModel):
+    latency_ms = 100
+    chunk_ms = 0
+
+
+@pytest.fixture
+def stock_app(monkeypatch):
+    service = MarketDataService(FakeMarketDataProvider(latency_ms=0))
+    monkeypatch.setattr("services.insights.stock_analysis.stock_service.market_data", service)
+    monkeypatch.setattr(routes, "compare_flight", routes.SingleFlight("stocks_compare_test"))
+    generation_client.set_model_factory(SlowFakeGenerativeModel)
+    app = FastAPI()
+    app.include_router(routes.router)
+    yield app
+    generation_client.set_model_factory(vertex_model)
+
+
+async def post_all(app, bodies):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(*(client.post("/stocks/compare", json=body) for body in bodies))
+
+
+def test_followers_get_their_normalized_symbols_back(stock_app):
+    responses = asyncio.run(post_all(stock_app, [
+        {"symbols": ["aapl", "MSFT"]},
+        {"symbols": ["MSFT", "AAPL"]},
+        {"symbols": [" msft ", "Aapl", "AAPL"]},
+    ]))
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    bodies = [response.json() for response in responses]
+    assert all(body["query"] == ["AAPL", "MSFT"] for body in bodies)
+    assert all(sorted(body["metrics"]) == ["AAPL", "MSFT"] for body in bodies)
+    assert len({body["analysis"] for body in bodies}) == 1
+    stats = routes.compare_flight.stats()
+    assert (stats["leaders"], stats["followers"]) == (1, 2)